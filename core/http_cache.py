@@ -0,0 +1,183 @@
+# http_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ConditionalRequestCache:
+    """
+    On-disk store of ETag/Last-Modified validators and response bodies,
+    used to revisit pages with conditional GET requests
+    
+    Indexes are kept in memory and written back by flush(), which store()
+    also triggers after every FLUSH_EVERY new pages
+    """
+    
+    # Pages stored between automatic index writes
+    FLUSH_EVERY = 50
+    
+    def __init__(self, directory: str = os.path.join("data", ".http_cache"), 
+                 max_entry_age: float = 7 * 24 * 3600):
+        self.directory = directory
+        self.max_entry_age = max_entry_age
+        self._indexes: Dict[str, Dict[str, Dict]] = {}
+        self._dirty: Set[str] = set()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+    
+    @staticmethod
+    def _host(url: str) -> str:
+        """Return a filesystem-safe host name for a URL"""
+        return urlparse(url).netloc.replace(':', '_') or 'local'
+    
+    def _index_path(self, host: str) -> str:
+        return os.path.join(self.directory, f"{host}.json")
+    
+    def _load_index(self, host: str) -> Dict[str, Dict]:
+        """Load the per-host index of cached URLs, reading it from disk once"""
+        if host not in self._indexes:
+            try:
+                with open(self._index_path(host), 'rb') as f:
+                    data = f.read()
+                index = orjson.loads(data) if orjson else json.loads(data)
+            except (OSError, ValueError):
+                index = {}
+            self._indexes[host] = index
+            self._prune(host, index)
+        return self._indexes[host]
+    
+    def _prune(self, host: str, index: Dict[str, Dict]) -> None:
+        """Drop entries older than max_entry_age along with their bodies"""
+        cutoff = time.time() - self.max_entry_age
+        expired = [url for url, entry in index.items() if entry.get('stored_at', 0) < cutoff]
+        for url in expired:
+            try:
+                os.remove(index.pop(url)['cached_body_path'])
+            except OSError:
+                pass
+        if expired:
+            self._dirty.add(host)
+    
+    def _entry(self, url: str) -> Optional[Dict]:
+        """Return the cache entry for a URL if its body is still on disk"""
+        with self._lock:
+            entry = self._load_index(self._host(url)).get(url)
+        if entry and os.path.exists(entry['cached_body_path']):
+            return entry
+        return None
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a cached URL"""
+        entry = self._entry(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def fresh_response(self, url: str, max_age: float) -> Optional[requests.Response]:
+        """Return the cached response of a URL if it was stored within max_age seconds"""
+        entry = self._entry(url)
+        if entry and time.time() - entry.get('stored_at', 0) <= max_age:
+            return self.cached_response(url)
+        return None
+    
+    def cached_response(self, url: str) -> Optional[requests.Response]:
+        """Rebuild a 200 response from the cached body of a URL"""
+        entry = self._entry(url)
+        if not entry:
+            return None
+        
+        try:
+            with open(entry['cached_body_path'], 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        if entry.get('content_type'):
+            response.headers['Content-Type'] = entry['content_type']
+        # requests sets this when it builds a response from the network
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+    
+    def store(self, url: str, response: requests.Response, always: bool = False) -> None:
+        """Save the validators and body of a response that has any, or of any response if always"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified and not always:
+            return
+        
+        host = self._host(url)
+        body_dir = os.path.join(self.directory, host)
+        body_path = os.path.join(
+            body_dir, hashlib.sha1(url.encode('utf-8')).hexdigest()
+        )
+        
+        try:
+            os.makedirs(body_dir, exist_ok=True)
+            with open(body_path, 'wb') as f:
+                f.write(response.content)
+            
+        except OSError:
+            # The cache is only an optimization; a failed write just means
+            # the next visit is a full request again
+            return
+        
+        with self._lock:
+            self._load_index(host)[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_type': response.headers.get('Content-Type'),
+                'cached_body_path': body_path,
+                'stored_at': time.time(),
+            }
+            self._dirty.add(host)
+            self._pending += 1
+            due = self._pending >= self.FLUSH_EVERY
+        
+        if due:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write every index changed since the last flush back to disk"""
+        with self._flush_lock:
+            # Snapshot under the lock, then serialize without holding up
+            # workers that are storing pages
+            with self._lock:
+                snapshots = {host: dict(self._indexes[host]) for host in self._dirty}
+                self._dirty.clear()
+                self._pending = 0
+            
+            for host, index in snapshots.items():
+                if orjson:
+                    data = orjson.dumps(index, option=orjson.OPT_INDENT_2)
+                else:
+                    data = json.dumps(index, indent=2).encode('utf-8')
+                path = self._index_path(host)
+                try:
+                    os.makedirs(self.directory, exist_ok=True)
+                    # Replace the index in one step so a crash mid-write
+                    # cannot leave a truncated file behind
+                    with open(f"{path}.tmp", 'wb') as f:
+                        f.write(data)
+                    os.replace(f"{path}.tmp", path)
+                except OSError:
+                    pass
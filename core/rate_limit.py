@@ -0,0 +1,89 @@
+# rate_limit.py
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that paces calls from any number of workers
+    to an average rate, allowing short bursts up to its capacity
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take a token, sleeping until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            
+            # Going negative reserves a future token, so concurrent callers
+            # queue up one interval apart instead of all waking at once
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RateController:
+    """
+    Adapts a token bucket's rate to how the server responds: the rate grows
+    additively while responses are healthy and halves on throttling (AIMD)
+    """
+    
+    # Status codes that mean the server wants us to slow down
+    THROTTLE_STATUSES = frozenset({429, 503})
+    
+    def __init__(self, bucket: TokenBucket, min_rate: float, max_rate: float, 
+                 step: float = None, alpha: float = 0.2):
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step if step is not None else bucket.rate / 10
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Wait out any Retry-After pause, then take a token from the bucket"""
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+        self.bucket.acquire()
+    
+    def record(self, status_code: Optional[int], latency: float, 
+               retry_after: Optional[str] = None) -> None:
+        """Adjust the rate from one response; a None status means the request failed"""
+        with self._lock:
+            # Latency EWMA, plus the best EWMA seen as the healthy baseline
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency = self.alpha * latency + (1 - self.alpha) * self.latency
+            if self._best_latency is None or self.latency < self._best_latency:
+                self._best_latency = self.latency
+            
+            if status_code is None or status_code in self.THROTTLE_STATUSES:
+                self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+                if retry_after and retry_after.isdigit():
+                    self._paused_until = max(
+                        self._paused_until, time.monotonic() + int(retry_after)
+                    )
+            elif status_code < 400 and self.latency <= max(
+                1.5 * self._best_latency, self._best_latency + 0.1
+            ):
+                # Only speed up while the server is not slowing down; the
+                # absolute slack keeps jitter on fast responses from counting
+                self.bucket.rate = min(self.max_rate, self.bucket.rate + self.step)
@@ -0,0 +1,46 @@
+# seen_store.py
+import os
+import sqlite3
+import threading
+import time
+from typing import List
+
+
+class SeenStore:
+    """
+    SQLite-backed record of story URLs that were already scraped, used to
+    skip them on later runs
+    """
+    
+    def __init__(self, path: str = os.path.join("data", "seen.db")):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY, first_seen REAL)"
+            )
+    
+    def unseen(self, urls: List[str]) -> List[str]:
+        """Return the URLs that have not been recorded yet, in their original order"""
+        with self._lock:
+            seen = {
+                url for url in urls
+                if self._conn.execute(
+                    "SELECT 1 FROM seen WHERE url = ?", (url,)
+                ).fetchone()
+            }
+        return [url for url in urls if url not in seen]
+    
+    def add(self, url: str) -> None:
+        """Record a URL as scraped"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO seen (url, first_seen) VALUES (?, ?)",
+                (url, time.time())
+            )
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
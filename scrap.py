@@ -1,5 +1,13 @@
 # scraper_factory.py
-from typing import Dict, Type
+import argparse
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from textwrap import shorten
+from typing import Dict, Optional, Tuple, Type
+import requests
 from core.base import BaseNewsScraper
 from scrapper.daily_star import DailyStarScraper
 from scrapper.prothom_alo import ProthomAloScraper
@@ -15,55 +23,115 @@ class ScraperFactory:
         'prothom_alo': ProthomAloScraper,
     }
     
+    # Names of the registered scrapers, rebuilt after each registration
+    _available_cache: Optional[Tuple[str, ...]] = None
+    
+    # Pooled session shared by every scraper the factory creates
+    _session: Optional[requests.Session] = None
+    
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Get the shared HTTP session, creating it on first use"""
+        if cls._session is None:
+            cls._session = BaseNewsScraper.create_session()
+        return cls._session
+    
     @classmethod
     def create_scraper(cls, scraper_type: str) -> BaseNewsScraper:
-        """Create a scraper instance based on type"""
+        """Get the scraper instance for a type, creating it on first use"""
         scraper_class = cls._scrapers.get(scraper_type.lower())
         if not scraper_class:
             available = ', '.join(cls._scrapers.keys())
             raise ValueError(f"Unknown scraper type: {scraper_type}. "
                            f"Available types: {available}")
-        return scraper_class()
+        return cls._make_scraper(scraper_type.lower())
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _make_scraper(cls, name: str) -> BaseNewsScraper:
+        """Build the scraper for a registered name once and reuse it afterwards"""
+        scraper_class = cls._scrapers[name]
+        if cls._accepts_session(scraper_class):
+            return scraper_class(session=cls.get_session())
+        
+        # Scrapers written before the shared session existed are built as
+        # before and handed the session afterwards
+        scraper = scraper_class()
+        scraper.session = cls.get_session()
+        return scraper
+    
+    @staticmethod
+    def _accepts_session(scraper_class) -> bool:
+        """Check whether a scraper class or factory takes a session keyword argument"""
+        try:
+            parameters = inspect.signature(scraper_class).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(
+            p.name == 'session' or p.kind is inspect.Parameter.VAR_KEYWORD
+            for p in parameters
+        )
     
     @classmethod
     def get_available_scrapers(cls) -> list:
         """Get list of available scraper types"""
-        return list(cls._scrapers.keys())
+        if cls._available_cache is None:
+            cls._available_cache = tuple(cls._scrapers)
+        # A fresh list, so callers cannot change the cached names
+        return list(cls._available_cache)
     
     @classmethod
     def register_scraper(cls, name: str, scraper_class: Type[BaseNewsScraper]):
-        """Register a new scraper type"""
+        """Register a new scraper type; it gets the shared session as a session
+        keyword argument if it takes one, or as its session attribute otherwise"""
         cls._scrapers[name] = scraper_class
+        cls._available_cache = None
+        cls._make_scraper.cache_clear()
 
 
 # usage_example.py
-def scrape_single_source(source: str, max_stories: int = None):
+@lru_cache(maxsize=None)
+def _display(name: str) -> str:
+    """Turn a scraper key like 'daily_star' into a display name"""
+    return name.title().replace('_', ' ')
+
+
+def scrape_single_source(source: str, max_stories: int = None, skip_seen: bool = False):
     """Scrape news from a single source"""
     try:
         scraper = ScraperFactory.create_scraper(source)
-        return scraper.run_complete_scrape(max_stories=max_stories, delay=2)
+        return scraper.run_complete_scrape(
+            max_stories=max_stories, delay=2, skip_seen=skip_seen
+        )
     except ValueError as e:
         print(f"Error: {e}")
         return []
 
 
-def scrape_all_sources(max_stories: int = None):
-    """Scrape news from all available sources"""
-    all_results = {}
+def scrape_all_sources(max_stories: int = None, skip_seen: bool = False):
+    """Scrape news from all available sources concurrently"""
+    sources = ScraperFactory.get_available_scrapers()
     
-    for source in ScraperFactory.get_available_scrapers():
+    def scrape(source):
         print(f"\n{'='*60}")
         print(f"Starting scrape for: {source}")
         print(f"{'='*60}")
         
         try:
             scraper = ScraperFactory.create_scraper(source)
-            results = scraper.run_complete_scrape(max_stories=max_stories, delay=2)
-            all_results[source] = results
+            results = scraper.run_complete_scrape(
+                max_stories=max_stories, delay=2, skip_seen=skip_seen
+            )
             print(f"✅ Successfully scraped {len(results)} stories from {source}")
+            return results
         except Exception as e:
             print(f"❌ Error scraping {source}: {e}")
-            all_results[source] = []
+            return []
+    
+    # Each source is a different host with its own delay between requests,
+    # so the sources are scraped side by side instead of one after another
+    with ThreadPoolExecutor(max_workers=max(1, len(sources))) as executor:
+        all_results = dict(zip(sources, executor.map(scrape, sources)))
     
     return all_results
 
@@ -78,7 +146,7 @@ def compare_sources(results: Dict):
     for source, stories in results.items():
         count = len(stories)
         total_stories += count
-        print(f"{source.title().replace('_', ' ')}: {count} stories")
+        print(f"{_display(source)}: {count} stories")
     
     print(f"Total stories across all sources: {total_stories}")
     
@@ -86,14 +154,15 @@ def compare_sources(results: Dict):
         print(f"\nSample headlines from each source:")
         for source, stories in results.items():
             if stories:
-                print(f"\n{source.title().replace('_', ' ')}:")
+                print(f"\n{_display(source)}:")
                 for i, story in enumerate(stories[:3], 1):
-                    print(f"  {i}. {story['headline'][:80]}...")
+                    print(f"  {i}. {shorten(story['headline'], width=80, placeholder='...')}")
 
 
 def main():
     """Main function demonstrating different usage patterns"""
-    import argparse
+    # Scrapers report progress through logging
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
     parser = argparse.ArgumentParser(description='News Scraper')
     parser.add_argument('--source', type=str, 
@@ -102,19 +171,21 @@ def main():
                        help='Maximum number of stories to scrape per source')
     parser.add_argument('--all', action='store_true',
                        help='Scrape from all available sources')
+    parser.add_argument('--skip-seen', action='store_true',
+                       help='Skip stories already scraped on earlier runs')
     
     args = parser.parse_args()
     
     if args.source:
         # Scrape from specific source
         print(f"Scraping from {args.source}...")
-        results = scrape_single_source(args.source, args.max_stories)
+        results = scrape_single_source(args.source, args.max_stories, args.skip_seen)
         print(f"Scraped {len(results)} stories from {args.source}")
         
     elif args.all:
         # Scrape from all sources
         print("Scraping from all available sources...")
-        results = scrape_all_sources(args.max_stories)
+        results = scrape_all_sources(args.max_stories, args.skip_seen)
         compare_sources(results)
         
     else:
@@ -122,7 +193,7 @@ def main():
         available_scrapers = ScraperFactory.get_available_scrapers()
         print("Available news sources:")
         for i, source in enumerate(available_scrapers, 1):
-            print(f"{i}. {source.title().replace('_', ' ')}")
+            print(f"{i}. {_display(source)}")
         print(f"{len(available_scrapers) + 1}. All sources")
         
         try:
@@ -165,8 +236,9 @@ Advanced usage examples showing extensibility and customization
 class CustomNewsScraper(BaseNewsScraper):
     """Example of how to create a new scraper by extending the base class"""
     
-    def __init__(self, source_name: str, url: str):
-        super().__init__(source_name)
+    def __init__(self, source_name: str, url: str, 
+                 session: Optional[requests.Session] = None):
+        super().__init__(source_name, session=session)
         self.url = url
     
     def scrape_stories(self):
@@ -183,14 +255,14 @@ def register_custom_scraper():
     # Register a custom scraper
     ScraperFactory.register_scraper(
         'custom_news',
-        lambda: CustomNewsScraper("Custom News", "https://example.com/news")
+        lambda session=None: CustomNewsScraper(
+            "Custom News", "https://example.com/news", session=session
+        )
     )
 
 
 def batch_scraping_with_error_handling():
     """Example of robust batch scraping with comprehensive error handling"""
-    import logging
-    
     # Setup logging
     logging.basicConfig(
         level=logging.INFO,
@@ -231,8 +303,6 @@ def batch_scraping_with_error_handling():
 
 def generate_scraping_report(results: Dict, failed_sources: list):
     """Generate a comprehensive scraping report"""
-    from datetime import datetime
-    
     report_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     print(f"\n{'='*80}")
@@ -251,19 +321,19 @@ def generate_scraping_report(results: Dict, failed_sources: list):
         print(f"\n✅ SUCCESSFUL SOURCES:")
         for source in successful_sources:
             story_count = len(results[source])
-            print(f"  • {source.title().replace('_', ' ')}: {story_count} stories")
+            print(f"  • {_display(source)}: {story_count} stories")
     
     if failed_sources:
         print(f"\n❌ FAILED SOURCES:")
         for source in failed_sources:
-            print(f"  • {source.title().replace('_', ' ')}")
+            print(f"  • {_display(source)}")
     
     print(f"\n📊 DETAILED BREAKDOWN:")
     for source, stories in results.items():
         if stories:
-            print(f"\n{source.title().replace('_', ' ')} ({len(stories)} stories):")
+            print(f"\n{_display(source)} ({len(stories)} stories):")
             for i, story in enumerate(stories[:3], 1):
-                headline = story['headline'][:60] + "..." if len(story['headline']) > 60 else story['headline']
+                headline = shorten(story['headline'], width=60, placeholder='...')
                 print(f"  {i}. {headline}")
             if len(stories) > 3:
                 print(f"  ... and {len(stories) - 3} more stories")
@@ -1,90 +1,124 @@
 # daily_star_scraper.py
 from core.base import BaseNewsScraper
+import requests
 from datetime import datetime
+import logging
+from lxml import etree
 from urllib.parse import urljoin
 from typing import List, Dict, Optional
 
+logger = logging.getLogger(__name__)
+
+# Listing cards and article pages are read with compiled XPath over an lxml
+# tree; the class tests match one class among several, like BeautifulSoup's
+# class filters
+_HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_CARDS_XPATH = etree.XPath(f"//div[{_HAS_CLASS.format('card')}]")
+_TITLE_XPATH = etree.XPath(f"(.//h3[{_HAS_CLASS.format('title')}])[1]")
+_CARD_IMAGE_XPATH = etree.XPath(f"(.//div[{_HAS_CLASS.format('card-image')}])[1]")
+_ARTICLE_XPATH = etree.XPath(f"(//article[{_HAS_CLASS.format('article-section')}])[1]")
+_ARTICLE_TITLE_XPATH = etree.XPath(f"(.//h1[{_HAS_CLASS.format('article-title')}])[1]")
+_MEDIA_XPATH = etree.XPath(f"(.//div[{_HAS_CLASS.format('section-media')}])[1]")
+_GALLERY_XPATH = etree.XPath(f".//span[{_HAS_CLASS.format('lg-gallery')}]")
+_CONTENT_XPATH = etree.XPath(f"(.//div[{_HAS_CLASS.format('clearfix')}])[1]")
+_PARAGRAPHS_XPATH = etree.XPath(".//p[not(@class)]")
+
+
+def _get_text(element) -> str:
+    """Join an element's stripped text pieces, as get_text(strip=True) does"""
+    return ''.join(text.strip() for text in element.itertext())
+
 
 class DailyStarScraper(BaseNewsScraper):
     """
     Scraper for The Daily Star education news
     """
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         super().__init__(
             source_name="The Daily Star - Education",
-            base_url="https://www.thedailystar.net"
+            base_url="https://www.thedailystar.net",
+            session=session
         )
         self.education_url = f"{self.base_url}/tags/education"
     
     def scrape_stories(self) -> List[Dict]:
         """Scrape basic story information from Daily Star education page"""
-        response = self.make_request(self.education_url)
+        response = self.make_request(self.education_url, conditional=True)
         if not response:
             return []
         
-        soup = self.parse_html(response)
-        if not soup:
+        tree = self.parse_html_tree(response)
+        if tree is None:
             return []
         
-        cards = soup.find_all('div', {'class': 'card'})
+        cards = _CARDS_XPATH(tree)
         stories = []
         
+        # One timestamp for every story found in this scrape
+        scraped_at = datetime.now().isoformat()
+        
         for card in cards:
-            story = self._extract_card_info(card)
+            story = self._extract_card_info(card, scraped_at)
             if story:
                 stories.append(story)
         
         return stories
     
-    def _extract_card_info(self, card) -> Optional[Dict]:
+    def _extract_card_info(self, card, scraped_at: str) -> Optional[Dict]:
         """Extract information from a Daily Star card element"""
         story = {
             'headline': None,
             'url': None,
             'hero_image_url': None,
             'last_published_at': None,
-            'scraped_at': datetime.now().isoformat()
+            'scraped_at': scraped_at
         }
         
         # Extract title and link
-        title_tag = card.find('h3', {'class': 'title'})
-        if title_tag and title_tag.a:
-            story['headline'] = title_tag.a.get_text(strip=True)
-            story['url'] = urljoin(self.base_url, title_tag.a['href'])
+        title_tags = _TITLE_XPATH(card)
+        link = title_tags[0].find('.//a') if title_tags else None
+        if link is not None:
+            story['headline'] = _get_text(link)
+            story['url'] = urljoin(self.base_url, link.attrib['href'])
         else:
             return None
         
         # Extract hero image
-        image_div = card.find('div', {'class': 'card-image'})
-        if image_div:
-            img_element = (image_div.a.picture.img 
-                         if image_div.a and image_div.a.picture and image_div.a.picture.img 
-                         else None)
-            if img_element and img_element.get('data-srcset'):
-                story['hero_image_url'] = img_element['data-srcset']
+        image_divs = _CARD_IMAGE_XPATH(card)
+        if image_divs:
+            # Follow the first link, then its first picture, like a.picture.img
+            img_element = image_divs[0].find('.//a')
+            for tag in ('picture', 'img'):
+                if img_element is not None:
+                    img_element = img_element.find(f'.//{tag}')
+            if img_element is not None and img_element.get('data-srcset'):
+                story['hero_image_url'] = img_element.get('data-srcset')
         
         # Extract published date
-        time_tag = card.find('time')
-        if time_tag:
+        time_tag = card.find('.//time')
+        if time_tag is not None:
             story['last_published_at'] = time_tag.get('datetime', '')
         
         return story
     
     def scrape_story_details(self, story_url: str) -> Optional[Dict]:
         """Scrape detailed content from an individual Daily Star news page"""
-        response = self.make_request(story_url)
+        response = self.make_request(
+            story_url, conditional=True, max_age=self.DETAIL_CACHE_MAX_AGE
+        )
         if not response:
             return None
         
-        soup = self.parse_html(response)
-        if not soup:
+        tree = self.parse_html_tree(response)
+        if tree is None:
             return None
         
         # Find the article section
-        story_div = soup.find('article', {'class': 'article-section'})
-        if not story_div:
-            print(f"No article section found for {story_url}")
+        articles = _ARTICLE_XPATH(tree)
+        story_div = articles[0] if articles else None
+        if story_div is None:
+            logger.warning("No article section found for %s", story_url)
             return None
         
         story_details = self._extract_article_details(story_div, story_url)
@@ -100,34 +134,33 @@ class DailyStarScraper(BaseNewsScraper):
         }
         
         # Extract title
-        story_title_tag = story_div.find('h1', {'class': 'article-title'})
-        if story_title_tag:
-            story_details['headline'] = story_title_tag.get_text(strip=True)
+        story_title_tags = _ARTICLE_TITLE_XPATH(story_div)
+        if story_title_tags:
+            story_details['headline'] = _get_text(story_title_tags[0])
         
         # Extract published date
-        time_tag = story_div.find('time')
-        if time_tag:
+        time_tag = story_div.find('.//time')
+        if time_tag is not None:
             story_details['last_published_at'] = time_tag.get('datetime', '')
         
         # Extract images from media section
-        story_media_div = story_div.find('div', {'class': 'section-media'})
-        if story_media_div:
-            img_tags = story_media_div.find_all('span', {'class': 'lg-gallery'})
+        story_media_divs = _MEDIA_XPATH(story_div)
+        if story_media_divs:
+            img_tags = _GALLERY_XPATH(story_media_divs[0])
             for tag in img_tags:
-                img_element = (tag.picture.img 
-                             if tag.picture and tag.picture.img 
-                             else None)
-                if img_element and img_element.get('data-srcset'):
-                    story_details['image_urls'].append(img_element['data-srcset'])
+                picture = tag.find('.//picture')
+                img_element = picture.find('.//img') if picture is not None else None
+                if img_element is not None and img_element.get('data-srcset'):
+                    story_details['image_urls'].append(img_element.get('data-srcset'))
         
         # Extract story description
-        story_content_div = story_div.find('div', {'class': 'clearfix'})
-        if story_content_div:
-            story_paragraphs = story_content_div.find_all('p', class_=False)
+        story_content_divs = _CONTENT_XPATH(story_div)
+        if story_content_divs:
+            story_paragraphs = _PARAGRAPHS_XPATH(story_content_divs[0])
             description_parts = []
             
             for p in story_paragraphs:
-                text = p.get_text(strip=True)
+                text = _get_text(p)
                 if text:
                     description_parts.append(text)
             
@@ -151,48 +184,34 @@ class DailyStarScraper(BaseNewsScraper):
         
         return story_details
     
-    def scrape_all_details(self, story_list: List[Dict], max_stories: int = None, 
-                          delay: int = 1) -> List[Dict]:
+    def _scrape_story(self, story: Dict) -> Optional[Dict]:
         """Override to handle hero image downloads"""
-        detailed_stories = []
-        
-        if max_stories:
-            story_list = story_list[:max_stories]
+        story_details = self.scrape_story_details(story['url'])
+        if not story_details:
+            return None
         
-        for i, story in enumerate(story_list, 1):
-            print(f"Scraping Daily Star story {i}/{len(story_list)}: {story['headline']}")
-            
-            story_details = self.scrape_story_details(story['url'])
-            if story_details:
-                # Generate slug and download hero image
-                slug = story_details['slug']
-                
-                # Download hero image if it exists in original story
-                hero_image_local = None
-                if story.get('hero_image_url'):
-                    hero_image_local = self.download_image(
-                        story['hero_image_url'], slug, "hero", "daily_star"
-                    )
-                    if hero_image_local:
-                        story_details['local_images'].append(hero_image_local)
-                
-                # Merge all data
-                merged_story = {
-                    **story,
-                    **story_details,
-                    'hero_image_local': hero_image_local
-                }
-                detailed_stories.append(merged_story)
-            else:
-                print(f"Failed to scrape details for: {story['headline']}")
-            
-            import time
-            time.sleep(delay)
+        # Generate slug and download hero image
+        slug = story_details['slug']
         
-        return detailed_stories
+        # Download hero image if it exists in original story
+        hero_image_local = None
+        if story.get('hero_image_url'):
+            hero_image_local = self.download_image(
+                story['hero_image_url'], slug, "hero", "daily_star"
+            )
+            if hero_image_local:
+                story_details['local_images'].append(hero_image_local)
+        
+        # Merge all data
+        return {
+            **story,
+            **story_details,
+            'hero_image_local': hero_image_local
+        }
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     scraper = DailyStarScraper()
     scraper.run_complete_scrape(delay=2)
 
@@ -1,9 +1,16 @@
 # prothom_alo_scraper.py
 from core.base import BaseNewsScraper
+import requests
 from datetime import datetime
+import logging
 import json
 import re
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Matches HTML tags left inside story text elements
+_TAG_RE = re.compile(r'<[^<]+?>')
 
 
 class ProthomAloScraper(BaseNewsScraper):
@@ -11,61 +18,66 @@ class ProthomAloScraper(BaseNewsScraper):
     Scraper for Prothom Alo education news
     """
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         super().__init__(
             source_name="Prothom Alo Education",
-            base_url="https://www.prothomalo.com"
+            base_url="https://www.prothomalo.com",
+            session=session
         )
         self.education_url = f"{self.base_url}/education"
         self.media_base_url = "https://media.prothomalo.com/"
     
     def scrape_stories(self) -> List[Dict]:
         """Scrape basic story information from Prothom Alo education page"""
-        response = self.make_request(self.education_url)
+        response = self.make_request(self.education_url, conditional=True)
         if not response:
             return []
         
-        soup = self.parse_html(response)
+        soup = self.parse_html(response, parse_only=self._JSON_SCRIPTS)
         if not soup:
             return []
         
-        # Extract JSON data from script tags
-        json_data_list = self.parse_json_from_script(soup)
-        
-        stories = []
-        for data in json_data_list:
-            if 'qt' in data and 'data' in data['qt']:
-                qt_data = data['qt']['data']
-                stories.extend(self._traverse_collections(qt_data))
+        # Extract the qt.data structure from script tags
+        qt_data_list = self.parse_json_path_from_script(soup, 'qt.data')
         
-        # Remove duplicates by slug
-        return self._remove_duplicate_stories(stories)
-    
-    def _traverse_collections(self, data: Any) -> List[Dict]:
-        """Recursively traverse through collections to find all stories"""
-        stories = []
+        # One timestamp for every story found in this scrape
+        scraped_at = datetime.now().isoformat()
         
-        if isinstance(data, dict):
-            if data.get('type') == 'collection' and 'items' in data:
-                for item in data['items']:
-                    stories.extend(self._traverse_collections(item))
-            elif data.get('type') == 'story':
-                story_data = data.get('story', data)
-                story = self._extract_story_info(story_data)
-                if story:
-                    stories.append(story)
-            else:
-                for value in data.values():
-                    if isinstance(value, (dict, list)):
-                        stories.extend(self._traverse_collections(value))
+        # Stories keyed by slug; dicts keep insertion order, so this also
+        # removes duplicates while preserving the page order
+        unique_stories = {}
+        for qt_data in qt_data_list:
+            for story in self._iter_stories(qt_data, scraped_at):
+                unique_stories.setdefault(story['slug'], story)
         
-        elif isinstance(data, list):
-            for item in data:
-                stories.extend(self._traverse_collections(item))
+        return list(unique_stories.values())
+    
+    def _iter_stories(self, root: Any, scraped_at: str) -> Iterator[Dict]:
+        """Walk through collections with an explicit stack and yield every story"""
+        stack = [root]
         
-        return stories
+        while stack:
+            data = stack.pop()
+            
+            if isinstance(data, dict):
+                if data.get('type') == 'collection' and 'items' in data:
+                    # Reversed so items are visited in document order
+                    stack.extend(reversed(data['items']))
+                elif data.get('type') == 'story':
+                    story_data = data.get('story', data)
+                    story = self._extract_story_info(story_data, scraped_at)
+                    if story:
+                        yield story
+                else:
+                    stack.extend(reversed([
+                        value for value in data.values()
+                        if isinstance(value, (dict, list))
+                    ]))
+            
+            elif isinstance(data, list):
+                stack.extend(reversed(data))
     
-    def _extract_story_info(self, story_data: Dict) -> Optional[Dict]:
+    def _extract_story_info(self, story_data: Dict, scraped_at: str) -> Optional[Dict]:
         """Extract required information from a story object"""
         try:
             headline = story_data.get('headline')
@@ -86,32 +98,22 @@ class ProthomAloScraper(BaseNewsScraper):
                 'url': f"{self.base_url}/{slug}",
                 'last_published_at': story_data.get('last-published-at'),
                 'hero_image_url': hero_image_url,
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': scraped_at
             }
         
         except Exception as e:
-            print(f"Error extracting story info: {e}")
+            logger.error("Error extracting story info: %s", e)
             return None
     
-    def _remove_duplicate_stories(self, stories: List[Dict]) -> List[Dict]:
-        """Remove duplicate stories by slug"""
-        unique_stories = []
-        seen_slugs = set()
-        
-        for story in stories:
-            if story and story['slug'] not in seen_slugs:
-                seen_slugs.add(story['slug'])
-                unique_stories.append(story)
-        
-        return unique_stories
-    
     def scrape_story_details(self, story_url: str) -> Optional[Dict]:
         """Scrape detailed content from an individual Prothom Alo news page"""
-        response = self.make_request(story_url)
+        response = self.make_request(
+            story_url, conditional=True, max_age=self.DETAIL_CACHE_MAX_AGE
+        )
         if not response:
             return None
         
-        soup = self.parse_html(response)
+        soup = self.parse_html(response, parse_only=self._JSON_SCRIPTS)
         if not soup:
             return None
         
@@ -128,7 +130,7 @@ class ProthomAloScraper(BaseNewsScraper):
             except (KeyError, TypeError) as e:
                 continue
             except Exception as e:
-                print(f"Error processing JSON for {story_url}: {e}")
+                logger.error("Error processing JSON for %s: %s", story_url, e)
                 continue
         
         return None
@@ -175,12 +177,12 @@ class ProthomAloScraper(BaseNewsScraper):
             }
         
         except Exception as e:
-            print(f"Error extracting story details: {e}")
+            logger.error("Error extracting story details: %s", e)
             return None
     
     def _extract_content_from_cards(self, cards: List[Dict]) -> tuple[str, List[str]]:
         """Extract description and image URLs from story cards"""
-        description = ""
+        description_parts = []
         image_urls = []
         
         for card in cards:
@@ -195,8 +197,8 @@ class ProthomAloScraper(BaseNewsScraper):
                         text = element.get('text', '')
                         if text:
                             # Clean up text (remove HTML tags if any)
-                            text = re.sub('<[^<]+?>', '', text)
-                            description += text + "\n\n"
+                            text = _TAG_RE.sub('', text)
+                            description_parts.append(text)
                     
                     elif element_type == 'image':
                         image_s3_key = element.get('image-s3-key', '')
@@ -204,10 +206,12 @@ class ProthomAloScraper(BaseNewsScraper):
                             image_url = f"{self.media_base_url}{image_s3_key}"
                             image_urls.append(image_url)
         
-        return description, image_urls
+        # Join once at the end instead of growing a string per element
+        return "\n\n".join(description_parts), image_urls
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     scraper = ProthomAloScraper()
     scraper.run_complete_scrape(delay=2)
 
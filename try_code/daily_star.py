@@ -1,13 +1,102 @@
 # daily_store.py
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+import soupsieve as sv
+import lxml.html
+from lxml import etree
 import json
 import re
 from datetime import datetime
 import os
-import time
+import sys
+import threading
 from urllib.parse import urljoin
-import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Run as a script from try_code/, so the repository root is put on the path
+# to share the rate limiter in core/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.rate_limit import TokenBucket
+
+try:
+    # Lexbor-backed selectolax is much faster for these class selectors
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Falls back to the stdlib json when orjson is not installed
+_json_loads = orjson.loads if orjson else json.loads
+
+def _json_dumps(data, compact=True):
+    """Serialize data to UTF-8 JSON in one buffer for a single write, indented unless compact"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=option)
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+# Images downloaded at once across all stories of a detail scrape
+IMAGE_WORKERS = 8
+
+# One keep-alive session for every request to the site and its image host,
+# so the TLS handshake is paid once per host instead of once per URL; 32
+# sockets cover the default story workers plus the shared image workers
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'bn,en;q=0.9,en-US;q=0.8',
+})
+
+# Card lookups follow the first match of each selector in turn, like the
+# card.find(...).a.picture.img chains; compiled once for the BeautifulSoup path
+_CARD_LINK_SELECTORS = ('h3.title', 'a')
+_CARD_IMAGE_SELECTORS = ('div.card-image', 'a', 'picture', 'img')
+_CARD_LINK_CSS = [sv.compile(selector) for selector in _CARD_LINK_SELECTORS]
+_CARD_IMAGE_CSS = [sv.compile(selector) for selector in _CARD_IMAGE_SELECTORS]
+
+def _select_chain(node, selectors, select_one):
+    """Follow select_one(selector, node) for each selector in turn, or return None"""
+    for selector in selectors:
+        node = select_one(selector, node)
+        if node is None:
+            return None
+    return node
+
+def _lexbor_first(selector, node):
+    return node.css_first(selector)
+
+# Without selectolax, article pages are read with XPath compiled once here;
+# the class tests match one class among several, like BeautifulSoup's.
+# lxml parsers must not be shared between threads, so each worker gets one
+_PARSER_LOCAL = threading.local()
+_HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_ARTICLE_XPATH = etree.XPath(f"(//article[{_HAS_CLASS.format('article-section')}])[1]")
+_ARTICLE_TITLE_XPATH = etree.XPath(f"(.//h1[{_HAS_CLASS.format('article-title')}])[1]")
+_MEDIA_XPATH = etree.XPath(f"(.//div[{_HAS_CLASS.format('section-media')}])[1]")
+_GALLERY_XPATH = etree.XPath(f".//span[{_HAS_CLASS.format('lg-gallery')}]")
+_CONTENT_XPATH = etree.XPath(f"(.//div[{_HAS_CLASS.format('clearfix')}])[1]")
+_PARAGRAPHS_XPATH = etree.XPath(".//p[not(@class)]")
+
+def _html_parser():
+    """Return this thread's UTF-8 lxml HTML parser, creating it on first use"""
+    parser = getattr(_PARSER_LOCAL, 'parser', None)
+    if parser is None:
+        parser = _PARSER_LOCAL.parser = lxml.html.HTMLParser(encoding='utf-8')
+    return parser
+
+def _get_text(element):
+    """Join an element's stripped text pieces, as get_text(strip=True) does"""
+    return ''.join(text.strip() for text in element.itertext())
 
 def scrape_daily_star_education():
     # Base URL of the website
@@ -15,51 +104,18 @@ def scrape_daily_star_education():
     # URL of the education section
     url = base_url + "/tags/education"
     
-    # Headers to mimic a browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'bn,en;q=0.9,en-US;q=0.8',
-    }
-    
     try:
         # Send GET request to the website
-        response = requests.get(url, headers=headers, timeout=30)
+        response = SESSION.get(url, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
         
         # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
-        cards = soup.find_all('div', {'class': 'card'})
-        stories = []
-        
-        for card in cards:
-            title_tag = card.find('h3', {'class': 'title'})
-            story = {
-                'headline': None,
-                'url': None,
-                'hero_image_url': None,
-                'last_published_at': None,
-                'scraped_at': datetime.now().isoformat()
-            }
-
-            # Extract title and link
-            if title_tag and title_tag.a:
-                title = title_tag.a.get_text(strip=True)
-                link = urljoin(base_url, title_tag.a['href'])
-                story['headline'] = title
-                story['url'] = link
-            
-            # Extract card-image if available
-            image_div = card.find('div', {'class': 'card-image'})
-            if image_div:
-                image_url = image_div.a.picture.img['data-srcset'] if image_div.a and image_div.a.picture and image_div.a.picture.img else None
-                story['hero_image_url'] = image_url
-
-            # Extract published date if available
-            time_tag = card.find('time')
-            if time_tag:
-                story['last_published_at'] = time_tag.get('datetime', '')
-
-            stories.append(story)
+        # One timestamp for every card on the page
+        scraped_at = datetime.now().isoformat()
+        if LexborHTMLParser:
+            stories = parse_cards_lexbor(response.content, base_url, scraped_at)
+        else:
+            stories = parse_cards_bs4(response.content, base_url, scraped_at)
         
         return stories
         
@@ -70,72 +126,96 @@ def scrape_daily_star_education():
         print(f"Error parsing the page: {e}")
         return []
 
-def scrape_daily_star_news_details(story_url):
+def parse_cards_bs4(content, base_url, scraped_at):
+    """Extract story cards from the listing page with BeautifulSoup"""
+    soup = BeautifulSoup(content, 'lxml', from_encoding='utf-8')
+    cards = soup.find_all('div', {'class': 'card'})
+    stories = []
+    
+    for card in cards:
+        story = {
+            'headline': None,
+            'url': None,
+            'hero_image_url': None,
+            'last_published_at': None,
+            'scraped_at': scraped_at
+        }
+
+        # Extract title and link
+        link_tag = _select_chain(card, _CARD_LINK_CSS, sv.SoupSieve.select_one)
+        if link_tag:
+            story['headline'] = link_tag.get_text(strip=True)
+            story['url'] = urljoin(base_url, link_tag['href'])
+        
+        # Extract card-image if available
+        img = _select_chain(card, _CARD_IMAGE_CSS, sv.SoupSieve.select_one)
+        story['hero_image_url'] = img.get('data-srcset') if img else None
+
+        # Extract published date if available
+        time_tag = card.find('time')
+        if time_tag:
+            story['last_published_at'] = time_tag.get('datetime', '')
+
+        stories.append(story)
+    
+    return stories
+
+def parse_cards_lexbor(content, base_url, scraped_at):
+    """Extract story cards from the listing page with selectolax"""
+    tree = LexborHTMLParser(content.decode('utf-8', errors='replace'))
+    stories = []
+    
+    for card in tree.css('div.card'):
+        story = {
+            'headline': None,
+            'url': None,
+            'hero_image_url': None,
+            'last_published_at': None,
+            'scraped_at': scraped_at
+        }
+
+        # Extract title and link
+        link_tag = _select_chain(card, _CARD_LINK_SELECTORS, _lexbor_first)
+        if link_tag:
+            story['headline'] = link_tag.text(separator='', strip=True)
+            story['url'] = urljoin(base_url, link_tag.attributes['href'])
+        
+        # Extract card-image if available
+        img = _select_chain(card, _CARD_IMAGE_SELECTORS, _lexbor_first)
+        story['hero_image_url'] = img.attributes.get('data-srcset') if img else None
+
+        # Extract published date if available
+        time_tag = card.css_first('time')
+        if time_tag:
+            story['last_published_at'] = time_tag.attributes.get('datetime', '')
+
+        stories.append(story)
+    
+    return stories
+
+def scrape_daily_star_news_details(story_url, scraped_at=None):
     """
     Scrape detailed content from an individual Daily Star news page
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'bn,en;q=0.9,en-US;q=0.8',
-    }
+    if scraped_at is None:
+        scraped_at = datetime.now().isoformat()
     
     try:
         # Send GET request to the story page
-        response = requests.get(story_url, headers=headers, timeout=30)
+        response = SESSION.get(story_url, timeout=30)
         response.raise_for_status()
         
-        # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
         story_details = {
             'headline': '',
             'description': '',
             'image_urls': [],
-            'scraped_at': datetime.now().isoformat()
+            'scraped_at': scraped_at
         }
         
         try:
-            # Find the article section
-            story_div = soup.find('article', {'class': 'article-section'})
-            if not story_div:
-                print(f"No article section found for {story_url}")
-                return None
-            
-            # Extract title
-            story_title_tag = story_div.find('h1', {'class': 'article-title'})
-            if story_title_tag:
-                story_details['headline'] = story_title_tag.get_text(strip=True)
-            
-            # Extract published date
-            time_tag = story_div.find('time')
-            if time_tag:
-                story_details['last_published_at'] = time_tag.get('datetime', '')
-            
-            # Extract images from media section
-            story_media_div = story_div.find('div', {'class': 'section-media'})
-            if story_media_div:
-                img_tags = story_media_div.find_all('span', {'class': 'lg-gallery'})
-                for tag in img_tags:
-                    if tag.picture and tag.picture.img and tag.picture.img.get('data-srcset'):
-                        img_url = tag.picture.img['data-srcset']
-                        story_details['image_urls'].append(img_url)
-            
-            # Extract story description - only paragraphs without classes
-            story_content_div = story_div.find('div', {'class': 'clearfix'})
-            if story_content_div:
-                # Find all p tags that don't have a class attribute
-                story_paragraphs = story_content_div.find_all('p', class_=False)
-                description_parts = []
-                
-                for p in story_paragraphs:
-                    text = p.get_text(strip=True)
-                    if text:  # Only add non-empty text
-                        description_parts.append(text)
-                
-                story_details['description'] = "\n\n".join(description_parts)
-            
-            return story_details
-            
+            if LexborHTMLParser:
+                return parse_article_lexbor(response.content, story_details, story_url)
+            return parse_article_lxml(response.content, story_details, story_url)
         except Exception as e:
             print(f"Error parsing story content for {story_url}: {e}")
             return None
@@ -147,52 +227,153 @@ def scrape_daily_star_news_details(story_url):
         print(f"Error parsing the story page {story_url}: {e}")
         return None
 
-def download_daily_star_images(image_urls, slug):
+def parse_article_lxml(content, story_details, story_url):
+    """Fill story_details from an article page with compiled lxml XPath"""
+    tree = lxml.html.document_fromstring(content, parser=_html_parser())
+    
+    # Find the article section
+    story_divs = _ARTICLE_XPATH(tree)
+    if not story_divs:
+        print(f"No article section found for {story_url}")
+        return None
+    story_div = story_divs[0]
+    
+    # Extract title
+    story_title_tags = _ARTICLE_TITLE_XPATH(story_div)
+    if story_title_tags:
+        story_details['headline'] = _get_text(story_title_tags[0])
+    
+    # Extract published date
+    time_tag = story_div.find('.//time')
+    if time_tag is not None:
+        story_details['last_published_at'] = time_tag.get('datetime', '')
+    
+    # Extract images from media section
+    story_media_divs = _MEDIA_XPATH(story_div)
+    if story_media_divs:
+        for tag in _GALLERY_XPATH(story_media_divs[0]):
+            picture = tag.find('.//picture')
+            img = picture.find('.//img') if picture is not None else None
+            if img is not None and img.get('data-srcset'):
+                story_details['image_urls'].append(img.get('data-srcset'))
+    
+    # Extract story description - only paragraphs without classes
+    story_content_divs = _CONTENT_XPATH(story_div)
+    if story_content_divs:
+        description_parts = []
+        for p in _PARAGRAPHS_XPATH(story_content_divs[0]):
+            text = _get_text(p)
+            if text:  # Only add non-empty text
+                description_parts.append(text)
+        
+        story_details['description'] = "\n\n".join(description_parts)
+    
+    return story_details
+
+def parse_article_lexbor(content, story_details, story_url):
+    """Fill story_details from an article page with selectolax"""
+    tree = LexborHTMLParser(content.decode('utf-8', errors='replace'))
+    
+    # Find the article section
+    story_div = tree.css_first('article.article-section')
+    if not story_div:
+        print(f"No article section found for {story_url}")
+        return None
+    
+    # Extract title
+    story_title_tag = story_div.css_first('h1.article-title')
+    if story_title_tag:
+        story_details['headline'] = story_title_tag.text(separator='', strip=True)
+    
+    # Extract published date
+    time_tag = story_div.css_first('time')
+    if time_tag:
+        story_details['last_published_at'] = time_tag.attributes.get('datetime', '')
+    
+    # Extract images from media section
+    story_media_div = story_div.css_first('div.section-media')
+    if story_media_div:
+        for tag in story_media_div.css('span.lg-gallery'):
+            picture = tag.css_first('picture')
+            img = picture.css_first('img') if picture else None
+            if img and img.attributes.get('data-srcset'):
+                story_details['image_urls'].append(img.attributes['data-srcset'])
+    
+    # Extract story description - only paragraphs without classes
+    story_content_div = story_div.css_first('div.clearfix')
+    if story_content_div:
+        description_parts = []
+        for p in story_content_div.css('p:not([class])'):
+            text = p.text(separator='', strip=True)
+            if text:  # Only add non-empty text
+                description_parts.append(text)
+        
+        story_details['description'] = "\n\n".join(description_parts)
+    
+    return story_details
+
+def _predicted_path(image_url, image_dir, image_name):
+    """
+    Return the path a Daily Star image is saved to in its story's image directory
+    """
+    # Get file extension from URL or use default
+    file_extension = os.path.splitext(image_url.split('?')[0])[1]  # Remove query parameters
+    if not file_extension or len(file_extension) > 5:  # Sanity check
+        file_extension = ".jpg"
+    
+    return os.path.join(image_dir, f"{image_name}{file_extension}")
+
+def download_daily_star_images(image_urls, image_dir, executor=None):
     """
-    Download multiple images from Daily Star and return their local paths
+    Download multiple images from Daily Star and return their local paths,
+    on the given executor or on a pool of their own
     """
-    local_paths = []
+    # Images already on disk from an earlier run are used as they are;
+    # only the missing ones are handed to the download pool
+    local_paths = [None] * len(image_urls)
+    todo = []
     for i, image_url in enumerate(image_urls):
-        local_path = download_daily_star_image(image_url, slug, f"image_{i+1}")
-        if local_path:
-            local_paths.append(local_path)
+        filepath = _predicted_path(image_url, image_dir, f"image_{i+1}")
+        if os.path.exists(filepath):
+            local_paths[i] = os.path.relpath(filepath, "data")
+        else:
+            todo.append((i, image_url))
+    
+    if todo:
+        # Each image is an independent download over the shared session
+        def download(item):
+            return download_daily_star_image(item[1], image_dir, f"image_{item[0]+1}")
+        
+        if executor:
+            results = list(executor.map(download, todo))
+        else:
+            with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as own_executor:
+                results = list(own_executor.map(download, todo))
+        for (i, _), local_path in zip(todo, results):
+            local_paths[i] = local_path
     
-    return local_paths
+    return [local_path for local_path in local_paths if local_path]
 
-def download_daily_star_image(image_url, slug, image_name):
+def download_daily_star_image(image_url, image_dir, image_name, session=None):
     """
-    Download a single image from Daily Star and return its local path
+    Download a single image from Daily Star into an existing directory and return its local path
     """
     try:
-        # Create images directory if it doesn't exist
-        image_dir = os.path.join("data", "images", "daily_star", slug)
-        os.makedirs(image_dir, exist_ok=True)
-        
-        # Get file extension from URL or use default
-        file_extension = os.path.splitext(image_url.split('?')[0])[1]  # Remove query parameters
-        if not file_extension or len(file_extension) > 5:  # Sanity check
-            file_extension = ".jpg"
-        
-        # Create filename
-        filename = f"{image_name}{file_extension}"
-        filepath = os.path.join(image_dir, filename)
+        filepath = _predicted_path(image_url, image_dir, image_name)
+        filename = os.path.basename(filepath)
         
         # Skip if file already exists
         if os.path.exists(filepath):
             return os.path.relpath(filepath, "data")
         
         # Download the image
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(image_url, headers=headers, stream=True, timeout=30)
+        response = (session or SESSION).get(image_url, stream=True, timeout=30)
         response.raise_for_status()
         
         # Save the image
         with open(filepath, 'wb') as out_file:
-            response.raw.decode_content = True
-            shutil.copyfileobj(response.raw, out_file)
+            for chunk in response.iter_content(chunk_size=65536):
+                out_file.write(chunk)
         
         print(f"Downloaded image: {filename}")
         
@@ -203,54 +384,114 @@ def download_daily_star_image(image_url, slug, image_name):
         print(f"Error downloading image {image_url}: {e}")
         return None
 
-def scrape_all_daily_star_news_details(story_list, max_stories=None, delay=1):
+def scrape_daily_star_story(story, index, total, scraped_at, bucket=None, image_executor=None):
     """
-    Scrape details for all Daily Star stories in the list
+    Scrape details and images for one Daily Star story
     """
-    detailed_stories = []
+    # Wait for a token so the workers together stay under the site's rate
+    if bucket:
+        bucket.acquire()
     
+    print(f"Scraping Daily Star story {index}/{total}: {story['headline']}")
+    
+    story_details = scrape_daily_star_news_details(story['url'], scraped_at)
+    merged_story = None
+    if story_details:
+        # Generate slug from URL for image directory
+        slug = story['url'].split('/')[-1]  # Use the last part of URL as slug
+        if '?' in slug:  # Remove query parameters if any
+            slug = slug.split('?')[0]
+        
+        # Create the story's images directory once for all of its downloads
+        image_dir = os.path.join("data", "images", "daily_star", slug)
+        if story_details['image_urls'] or story.get('hero_image_url'):
+            os.makedirs(image_dir, exist_ok=True)
+        
+        # Download images and get local paths
+        local_images = download_daily_star_images(
+            story_details['image_urls'], image_dir, image_executor
+        )
+        
+        # Download hero image if it exists
+        hero_image_local = None
+        if story.get('hero_image_url'):
+            hero_image_local = download_daily_star_image(story['hero_image_url'], image_dir, "hero")
+            if hero_image_local:
+                local_images.append(hero_image_local)
+        
+        # Merge basic story info with details
+        merged_story = {
+            **story,
+            **story_details,
+            'slug': slug,
+            'local_images': local_images,
+            'hero_image_local': hero_image_local
+        }
+    else:
+        print(f"Failed to scrape details for: {story['headline']}")
+    
+    return merged_story
+
+def iter_daily_star_news_details(story_list, max_stories=None, delay=1, max_workers=8):
+    """
+    Scrape details for Daily Star stories and yield each one that succeeds,
+    in the order of the list
+    """
     # Limit the number of stories if specified
     if max_stories:
         story_list = story_list[:max_stories]
     
-    for i, story in enumerate(story_list, 1):
-        print(f"Scraping Daily Star story {i}/{len(story_list)}: {story['headline']}")
-        
-        story_details = scrape_daily_star_news_details(story['url'])
-        if story_details:
-            # Generate slug from URL for image directory
-            slug = story['url'].split('/')[-1]  # Use the last part of URL as slug
-            if '?' in slug:  # Remove query parameters if any
-                slug = slug.split('?')[0]
-            
-            # Download images and get local paths
-            local_images = download_daily_star_images(story_details['image_urls'], slug)
-            
-            # Download hero image if it exists
-            hero_image_local = None
-            if story.get('hero_image_url'):
-                hero_image_local = download_daily_star_image(story['hero_image_url'], slug, "hero")
-                if hero_image_local:
-                    local_images.append(hero_image_local)
-            
-            # Merge basic story info with details
-            merged_story = {
-                **story,
-                **story_details,
-                'slug': slug,
-                'local_images': local_images,
-                'hero_image_local': hero_image_local
-            }
-            detailed_stories.append(merged_story)
-        else:
-            print(f"Failed to scrape details for: {story['headline']}")
-        
-        # Add delay to avoid overwhelming the server
-        time.sleep(delay)
+    total = len(story_list)
+    
+    # One timestamp for the whole detail scrape
+    scraped_at = datetime.now().isoformat()
+    
+    # Instead of every worker sleeping delay seconds after each story, story
+    # requests share a token bucket: one story per delay per worker on
+    # average, with bursts of up to max_workers
+    bucket = TokenBucket(max_workers / delay, capacity=max_workers) if delay else None
+    
+    # Stories are independent page fetches, so a few run at a time;
+    # map keeps the results in the order of the listing. Their images share
+    # one pool, so at most max_workers + IMAGE_WORKERS requests are in flight
+    with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as image_executor, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            lambda item: scrape_daily_star_story(
+                item[1], item[0], total, scraped_at, bucket, image_executor
+            ),
+            enumerate(story_list, 1)
+        )
+        for story in results:
+            if story:
+                yield story
+
+def scrape_all_daily_star_news_details(story_list, max_stories=None, delay=1, max_workers=8):
+    """
+    Scrape details for all Daily Star stories in the list
+    """
+    return list(iter_daily_star_news_details(story_list, max_stories, delay, max_workers))
+
+def stream_daily_star_details_to_jsonl(story_list, filepath, max_stories=None, delay=1,
+                                       max_workers=8):
+    """
+    Scrape details for all Daily Star stories in the list, appending each to
+    a JSON Lines file as it finishes, and return how many were written
+    """
+    _prepare_jsonl(filepath)
+    
+    # Flushed per story, so a crash keeps the finished ones and memory holds
+    # only the stories not yet written
+    story_count = 0
+    with open(filepath, 'ab') as f:
+        for story in iter_daily_star_news_details(story_list, max_stories, delay, max_workers):
+            f.write(_json_dumps(story) + b'\n')
+            f.flush()
+            story_count += 1
     
-    return detailed_stories
+    return story_count
 
-def save_daily_star_to_json(stories, filename=None, directory="data"):
+def save_daily_star_to_json(stories, filename=None, directory="data", compact=True):
     """Save Daily Star stories to a JSON file with Unicode support"""
     # Create directory if it doesn't exist
     if not os.path.exists(directory):
@@ -272,18 +513,43 @@ def save_daily_star_to_json(stories, filename=None, directory="data"):
         "stories": stories
     }
     
-    # Save to JSON with ensure_ascii=False to preserve Bangla characters
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Save to JSON as UTF-8 to preserve Bangla characters; indentation is
+    # only added when a human-readable file is asked for with compact=False
+    with open(filepath, 'wb') as f:
+        f.write(_json_dumps(data, compact))
     
     print(f"Data successfully saved to {filepath}")
     return filepath
 
+def save_daily_star_to_jsonl(stories, filepath):
+    """Append Daily Star stories to a JSON Lines file, one story per line"""
+    _prepare_jsonl(filepath)
+    
+    with open(filepath, 'ab') as f:
+        f.write(b''.join(_json_dumps(story) + b'\n' for story in stories))
+    
+    return filepath
+
+def _prepare_jsonl(filepath):
+    """Create a JSON Lines file's directory and its metadata sidecar if missing"""
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    # The source metadata kept at the top of the JSON file goes in a sidecar
+    meta_path = filepath + ".meta.json"
+    if not os.path.exists(meta_path):
+        with open(meta_path, 'wb') as f:
+            f.write(_json_dumps({
+                "source": "The Daily Star - Education",
+                "created_at": datetime.now().isoformat()
+            }))
+
 def load_from_json(filename):
     """Load stories from a JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = _json_loads(f.read())
         return data
     except FileNotFoundError:
         print(f"File {filename} not found.")
@@ -292,6 +558,19 @@ def load_from_json(filename):
         print(f"Error loading JSON file: {e}")
         return None
 
+def load_first_from_jsonl(filepath):
+    """Load the first story from a JSON Lines file"""
+    try:
+        with open(filepath, 'rb') as f:
+            line = f.readline()
+        return _json_loads(line) if line.strip() else None
+    except FileNotFoundError:
+        print(f"File {filepath} not found.")
+        return None
+    except Exception as e:
+        print(f"Error loading JSON Lines file: {e}")
+        return None
+
 def print_stories(stories, limit=5):
     """Print stories in a formatted way"""
     if not stories:
@@ -322,29 +601,31 @@ def main():
         # Print the first few stories
         print_stories(stories)
         
-        # Scrape detailed content for all stories
+        # Scrape detailed content for all stories, writing each one to a
+        # JSON Lines file as it finishes
         print("\nScraping detailed content for each story...")
-        detailed_stories = scrape_all_daily_star_news_details(stories, delay=2)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        jsonl_path = os.path.join("data", f"daily_star_education_news_{timestamp}.jsonl")
+        story_count = stream_daily_star_details_to_jsonl(stories, jsonl_path, delay=2)
 
-        if detailed_stories:
-            # Save to JSON file
-            filename = save_daily_star_to_json(detailed_stories)
+        if story_count:
+            print(f"Data successfully saved to {jsonl_path}")
             
             # Demonstrate loading the data back
-            print("Loading data from JSON file to verify content...")
-            loaded_data = load_from_json(filename)
+            print("Loading the first story from the JSON Lines file to verify content...")
+            first_story = load_first_from_jsonl(jsonl_path)
             
-            if loaded_data:
-                print(f"Successfully loaded {loaded_data['story_count']} detailed stories")
+            if first_story:
+                print(f"Successfully saved {story_count} detailed stories")
                 print("Sample of first story:")
-                print(f"Headline: {loaded_data['stories'][0]['headline']}")
-                print(f"URL: {loaded_data['stories'][0]['url']}")
-                print(f"Description length: {len(loaded_data['stories'][0]['description'])} characters")
-                print(f"Local images: {len(loaded_data['stories'][0]['local_images'])}")
+                print(f"Headline: {first_story['headline']}")
+                print(f"URL: {first_story['url']}")
+                print(f"Description length: {len(first_story['description'])} characters")
+                print(f"Local images: {len(first_story['local_images'])}")
                 
                 # Print first 200 characters of description
-                if loaded_data['stories'][0]['description']:
-                    description_preview = loaded_data['stories'][0]['description'][:200] + "..." if len(loaded_data['stories'][0]['description']) > 200 else loaded_data['stories'][0]['description']
+                if first_story['description']:
+                    description_preview = first_story['description'][:200] + "..." if len(first_story['description']) > 200 else first_story['description']
                     print(f"Description preview: {description_preview}")
         else:
             print("No detailed stories found.")
@@ -4,6 +4,24 @@ import json
 import re
 from datetime import datetime
 import os
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Falls back to the stdlib json when orjson is not installed
+_json_loads = orjson.loads if orjson else json.loads
+
+def _json_dumps(data, compact=True):
+    """Serialize data to UTF-8 JSON in one buffer for a single write, indented unless compact"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=option)
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
 
 def scrape_prothom_alo_education():
     # URL of the education section
@@ -20,10 +38,12 @@ def scrape_prothom_alo_education():
         response.raise_for_status()  # Raise an exception for bad status codes
         
         # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', from_encoding='utf-8')
         
-        # Find all script tags with type application/json
+        # Find all script tags with type application/json; the Quintype
+        # page-data blob (id="static-page") holds the stories, so it goes first
         script_tags = soup.find_all('script', type='application/json')
+        script_tags.sort(key=lambda script: script.get('id') != 'static-page')
         
         articles = []
         
@@ -31,27 +51,27 @@ def scrape_prothom_alo_education():
         for script in script_tags:
             try:
                 # Parse the JSON data
-                data = json.loads(script.string)
+                data = _json_loads(str(script.string))
                 
                 # Look for articles in different possible JSON structures
                 articles.extend(extract_articles_from_json(data))
                 
+                # No other script is parsed once the page data has articles
+                if articles and isinstance(data, dict) and 'qt' in data:
+                    break
+                
             except json.JSONDecodeError:
                 continue
             except Exception as e:
                 print(f"Error processing JSON: {e}")
                 continue
         
-        # Remove duplicates by link
-        unique_articles = []
-        seen_links = set()
-        
+        # Remove duplicates; keyed by link in insertion order, so the first copy of each is kept
+        unique_articles = {}
         for article in articles:
-            if article['link'] not in seen_links:
-                seen_links.add(article['link'])
-                unique_articles.append(article)
+            unique_articles.setdefault(article['link'], article)
         
-        return unique_articles
+        return list(unique_articles.values())
         
     except requests.RequestException as e:
         print(f"Error fetching the page: {e}")
@@ -61,42 +81,51 @@ def scrape_prothom_alo_education():
         return []
 
 def extract_articles_from_json(data):
-    """Recursively search through JSON data for articles"""
+    """Search through JSON data for articles with an explicit stack"""
     articles = []
+    stack = [data]
     
-    # If data is a dictionary, search for articles
-    if isinstance(data, dict):
-        # Check if this dictionary represents an article
-        if is_article(data):
-            article = extract_article_info(data)
-            if article:
-                articles.append(article)
+    while stack:
+        node = stack.pop()
         
-        # Recursively search through all values
-        for value in data.values():
-            articles.extend(extract_articles_from_json(value))
-    
-    # If data is a list, search each item
-    elif isinstance(data, list):
-        for item in data:
-            articles.extend(extract_articles_from_json(item))
+        # If node is a dictionary, search for articles
+        if isinstance(node, dict):
+            # Check if this dictionary represents an article
+            if is_article(node):
+                article = extract_article_info(node)
+                if article:
+                    articles.append(article)
+            
+            # Search through all values; reversed so they are visited in order
+            stack.extend(reversed(list(node.values())))
+        
+        # If node is a list, search each item
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
     
     return articles
 
+# Matches HTML tags left inside titles
+_TAG_RE = re.compile(r'<[^<]+?>')
+
+# Common patterns for article objects, matched anywhere in a key name
+_ARTICLE_INDICATORS = ('headline', 'url', 'link', 'title', 'story', 'article')
+
+# Page JSON repeats a small set of key names; the bound keeps odd keys from piling up
+@lru_cache(maxsize=1024)
+def _is_article_key(key):
+    """Check if a key name contains an article indicator"""
+    key = key.lower()
+    return any(indicator in key for indicator in _ARTICLE_INDICATORS)
+
 def is_article(data):
     """Check if a dictionary represents an article"""
-    # Common patterns for article objects
-    article_indicators = ['headline', 'url', 'link', 'title', 'story', 'article']
-    
     if not isinstance(data, dict):
         return False
     
-    # Check if any article indicators are in the keys
-    for key in data.keys():
-        if any(indicator in str(key).lower() for indicator in article_indicators):
-            return True
-    
-    return False
+    # The same few key names repeat across the whole tree, so each one is
+    # only scanned for indicators the first time it is seen
+    return any(_is_article_key(str(key)) for key in data)
 
 def extract_article_info(article_data):
     """Extract title and link from article data"""
@@ -127,7 +156,7 @@ def extract_article_info(article_data):
     # Clean up title if it's found
     if title:
         # Remove HTML tags if any
-        title = re.sub('<[^<]+?>', '', str(title))
+        title = _TAG_RE.sub('', str(title))
         title = title.strip()
     
     if title and link:
@@ -135,7 +164,7 @@ def extract_article_info(article_data):
     
     return None
 
-def save_to_json(articles, filename=None):
+def save_to_json(articles, filename=None, compact=True):
     """Save articles to a JSON file with Unicode support"""
     if not filename:
         # Create filename with current timestamp
@@ -149,17 +178,18 @@ def save_to_json(articles, filename=None):
         "articles": articles
     }
     
-    # Save to JSON with ensure_ascii=False to preserve Bangla characters
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Save to JSON as UTF-8 to preserve Bangla characters; indentation is
+    # only added when a human-readable file is asked for with compact=False
+    with open(filename, 'wb') as f:
+        f.write(_json_dumps(data, compact))
     
     return filename
 
 def load_from_json(filename):
     """Load articles from a JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = _json_loads(f.read())
         return data
     except FileNotFoundError:
         print(f"File {filename} not found.")
@@ -7,6 +7,27 @@ import os
 import time
 from urllib.parse import urljoin
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Falls back to the stdlib json when orjson is not installed
+_json_loads = orjson.loads if orjson else json.loads
+
+def _json_dumps(data, compact=True):
+    """Serialize data to UTF-8 JSON in one buffer for a single write, indented unless compact"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=option)
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+# Story pages and S3-hosted images are built from these bases
+_SITE_BASE = "https://www.prothomalo.com/"
+_MEDIA_BASE = "https://media.prothomalo.com/"
+
 def scrape_prothom_alo_education():
     # URL of the education section
     url = "https://www.prothomalo.com/education"
@@ -23,24 +44,33 @@ def scrape_prothom_alo_education():
         response.raise_for_status()  # Raise an exception for bad status codes
         
         # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', from_encoding='utf-8')
         
-        # Find all script tags with type application/json
+        # Find all script tags with type application/json; the Quintype
+        # page-data blob (id="static-page") holds the stories, so it goes first
         script_tags = soup.find_all('script', type='application/json')
+        script_tags.sort(key=lambda script: script.get('id') != 'static-page')
         
         stories = []
         
+        # One timestamp for every story on the page
+        scraped_at = datetime.now().isoformat()
+        
         # Process each script tag with JSON data
         for script in script_tags:
             try:
                 # Parse the JSON data
-                data = json.loads(script.string)
+                data = _json_loads(str(script.string))
                 
                 # Look for the qt.data structure
                 if 'qt' in data and 'data' in data['qt']:
                     qt_data = data['qt']['data']
-                    # Recursively traverse the data to find all stories
-                    stories.extend(traverse_collections(qt_data))
+                    # Traverse the data to find all stories
+                    stories.extend(traverse_collections(qt_data, scraped_at))
+                    
+                    # No other script is parsed once the page data has stories
+                    if stories:
+                        break
                 
             except json.JSONDecodeError:
                 continue
@@ -48,16 +78,12 @@ def scrape_prothom_alo_education():
                 print(f"Error processing JSON: {e}")
                 continue
         
-        # Remove duplicates by slug
-        unique_stories = []
-        seen_slugs = set()
-        
+        # Remove duplicates; keyed by slug in insertion order, so the first copy of each is kept
+        unique_stories = {}
         for story in stories:
-            if story['slug'] not in seen_slugs:
-                seen_slugs.add(story['slug'])
-                unique_stories.append(story)
+            unique_stories.setdefault(story['slug'], story)
         
-        return unique_stories
+        return list(unique_stories.values())
         
     except requests.RequestException as e:
         print(f"Error fetching the page: {e}")
@@ -66,39 +92,43 @@ def scrape_prothom_alo_education():
         print(f"Error parsing the page: {e}")
         return []
 
-def traverse_collections(data):
+def traverse_collections(data, scraped_at):
     """
-    Recursively traverse through collections to find all stories
+    Walk through collections with an explicit stack to find all stories
     """
     stories = []
+    stack = [data]
     
-    # If data is a dictionary
-    if isinstance(data, dict):
-        # Check if this is a collection
-        if data.get('type') == 'collection' and 'items' in data:
-            # Process each item in the collection
-            for item in data['items']:
-                stories.extend(traverse_collections(item))
-        
-        # Check if this is a story
-        elif data.get('type') == 'story':
-            story = extract_story_info(data['story'])
-            if story:
-                stories.append(story)
-        
-        # Recursively search through all values
-        for value in data.values():
-            if isinstance(value, (dict, list)):
-                stories.extend(traverse_collections(value))
-    
-    # If data is a list, process each item
-    elif isinstance(data, list):
-        for item in data:
-            stories.extend(traverse_collections(item))
+    while stack:
+        node = stack.pop()
+        
+        # If node is a dictionary
+        if isinstance(node, dict):
+            # Check if this is a collection; only its items can hold stories
+            if node.get('type') == 'collection' and 'items' in node:
+                # Reversed so items are visited in document order
+                stack.extend(reversed(node['items']))
+            
+            # Check if this is a story; nothing below it is walked
+            elif node.get('type') == 'story':
+                story = extract_story_info(node['story'], scraped_at)
+                if story:
+                    stories.append(story)
+            
+            # Otherwise search through all nested values
+            else:
+                stack.extend(reversed([
+                    value for value in node.values()
+                    if isinstance(value, (dict, list))
+                ]))
+        
+        # If node is a list, process each item
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
     
     return stories
 
-def extract_story_info(story_data):
+def extract_story_info(story_data, scraped_at):
     """
     Extract required information from a story object
     """
@@ -121,10 +151,10 @@ def extract_story_info(story_data):
         hero_image_url = None
         if hero_image_s3_key:
             # Construct the full image URL (this might need adjustment based on actual URL pattern)
-            hero_image_url = f"https://media.prothomalo.com/{hero_image_s3_key}"
+            hero_image_url = _MEDIA_BASE + hero_image_s3_key
         
         # Construct the story URL
-        story_url = f"https://www.prothomalo.com/{slug}"
+        story_url = _SITE_BASE + slug
         
         return {
             'headline': headline,
@@ -132,14 +162,14 @@ def extract_story_info(story_data):
             'url': story_url,
             'last_published_at': last_published_at,
             'hero_image_url': hero_image_url,
-            'scraped_at': datetime.now().isoformat()
+            'scraped_at': scraped_at
         }
     
     except Exception as e:
         print(f"Error extracting story info: {e}")
         return None
 
-def save_to_json(stories, filename=None, directory="data"):
+def save_to_json(stories, filename=None, directory="data", compact=True):
     """Save stories to a JSON file with Unicode support"""
     # Create directory if it doesn't exist
     if not os.path.exists(directory):
@@ -161,9 +191,10 @@ def save_to_json(stories, filename=None, directory="data"):
         "stories": stories
     }
     
-    # Save to JSON with ensure_ascii=False to preserve Bangla characters
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Save to JSON as UTF-8 to preserve Bangla characters; indentation is
+    # only added when a human-readable file is asked for with compact=False
+    with open(filepath, 'wb') as f:
+        f.write(_json_dumps(data, compact))
     
     print(f"Data successfully saved to {filepath}")
     return filepath
@@ -171,8 +202,8 @@ def save_to_json(stories, filename=None, directory="data"):
 def load_from_json(filename):
     """Load stories from a JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = _json_loads(f.read())
         return data
     except FileNotFoundError:
         print(f"File {filename} not found.")
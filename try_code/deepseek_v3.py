@@ -1,47 +1,105 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import re
 from datetime import datetime
 import os
 import time
 from urllib.parse import urljoin
-import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Falls back to the stdlib json when orjson is not installed
+_json_loads = orjson.loads if orjson else json.loads
+
+def _json_dumps(data, compact=True):
+    """Serialize data to UTF-8 JSON in one buffer for a single write, indented unless compact"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=option)
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _load_qt_data(text):
+    """Return the qt.data object of a page's JSON blob, or None if it has none"""
+    data = _json_loads(text)
+    if 'qt' in data and 'data' in data['qt']:
+        return data['qt']['data']
+    return None
+
+# Only the JSON script tags are needed from each page
+_JSON_SCRIPTS = SoupStrainer('script', attrs={'type': 'application/json'})
+
+# Image directories already created during this run
+_KNOWN_DIRS = set()
+
+# Story pages and S3-hosted images are built from these bases
+_SITE_BASE = "https://www.prothomalo.com/"
+_MEDIA_BASE = "https://media.prothomalo.com/"
+
+# Matches HTML tags left inside story text elements
+_TAG_RE = re.compile(r'<[^<]+?>')
+
+# Shared session so repeated requests to prothomalo.com / media.prothomalo.com
+# reuse pooled keep-alive connections instead of a new TCP+TLS handshake each time
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'bn,en;q=0.9,en-US;q=0.8',
+})
 
 def scrape_prothom_alo_education():
     # URL of the education section
     url = "https://www.prothomalo.com/education"
     
-    # Headers to mimic a browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'bn,en;q=0.9,en-US;q=0.8',
-    }
-    
     try:
         # Send GET request to the website
-        response = requests.get(url, headers=headers, timeout=30)
+        response = _SESSION.get(url, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
         
         # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=_JSON_SCRIPTS)
         
-        # Find all script tags with type application/json
+        # Find all script tags with type application/json; the Quintype
+        # page-data blob (id="static-page") holds the stories, so it goes first
         script_tags = soup.find_all('script', type='application/json')
+        script_tags.sort(key=lambda script: script.get('id') != 'static-page')
+        
+        # One timestamp for every story found in this scrape
+        scraped_at = datetime.now().isoformat()
         
-        stories = []
+        # Stories keyed by slug; dicts keep insertion order, so this also
+        # removes duplicates while preserving the page order
+        unique_stories = {}
         
         # Process each script tag with JSON data
         for script in script_tags:
             try:
-                # Parse the JSON data
-                data = json.loads(script.string)
+                # Parse the qt.data structure out of the JSON data
+                qt_data = _load_qt_data(str(script.string))
                 
-                # Look for the qt.data structure
-                if 'qt' in data and 'data' in data['qt']:
-                    qt_data = data['qt']['data']
-                    # Recursively traverse the data to find all stories
-                    stories.extend(traverse_collections(qt_data))
+                if qt_data is not None:
+                    # Walk the data to find all stories, keeping the first per slug
+                    for story in iter_stories(qt_data, scraped_at):
+                        unique_stories.setdefault(story['slug'], story)
+                    
+                    # No other script is parsed once the page data has stories
+                    if unique_stories:
+                        break
                 
             except json.JSONDecodeError:
                 continue
@@ -49,16 +107,7 @@ def scrape_prothom_alo_education():
                 print(f"Error processing JSON: {e}")
                 continue
         
-        # Remove duplicates by slug
-        unique_stories = []
-        seen_slugs = set()
-        
-        for story in stories:
-            if story and story['slug'] not in seen_slugs:
-                seen_slugs.add(story['slug'])
-                unique_stories.append(story)
-        
-        return unique_stories
+        return list(unique_stories.values())
         
     except requests.RequestException as e:
         print(f"Error fetching the page: {e}")
@@ -67,41 +116,43 @@ def scrape_prothom_alo_education():
         print(f"Error parsing the page: {e}")
         return []
 
-def traverse_collections(data):
+def iter_stories(root, scraped_at):
     """
-    Recursively traverse through collections to find all stories
+    Walk through collections with an explicit stack and yield every story
     """
-    stories = []
-    
-    # If data is a dictionary
-    if isinstance(data, dict):
-        # Check if this is a collection
-        if data.get('type') == 'collection' and 'items' in data:
-            # Process each item in the collection
-            for item in data['items']:
-                stories.extend(traverse_collections(item))
-        
-        # Check if this is a story
-        elif data.get('type') == 'story':
-            # Some stories might be nested under a 'story' key
-            story_data = data.get('story', data)
-            story = extract_story_info(story_data)
-            if story:
-                stories.append(story)
-        
-        # Recursively search through all values
-        for value in data.values():
-            if isinstance(value, (dict, list)):
-                stories.extend(traverse_collections(value))
-    
-    # If data is a list, process each item
-    elif isinstance(data, list):
-        for item in data:
-            stories.extend(traverse_collections(item))
+    stack = [root]
     
-    return stories
+    while stack:
+        node = stack.pop()
+        
+        # If node is a dictionary
+        if isinstance(node, dict):
+            node_type = node.get('type')
+            
+            # Check if this is a story
+            if node_type == 'story':
+                # Some stories might be nested under a 'story' key
+                story = extract_story_info(node.get('story', node), scraped_at)
+                if story:
+                    yield story
+            
+            # Check if this is a collection
+            elif node_type == 'collection' and 'items' in node:
+                # Reversed so items are visited in document order
+                stack.extend(reversed(node['items']))
+            
+            # Otherwise search through all nested values
+            else:
+                stack.extend(reversed([
+                    value for value in node.values()
+                    if isinstance(value, (dict, list))
+                ]))
+        
+        # If node is a list, process each item
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
 
-def extract_story_info(story_data):
+def extract_story_info(story_data, scraped_at):
     """
     Extract required information from a story object
     """
@@ -124,10 +175,10 @@ def extract_story_info(story_data):
         hero_image_url = None
         if hero_image_s3_key:
             # Construct the full image URL
-            hero_image_url = f"https://media.prothomalo.com/{hero_image_s3_key}"
+            hero_image_url = _MEDIA_BASE + hero_image_s3_key
         
         # Construct the story URL
-        story_url = f"https://www.prothomalo.com/{slug}"
+        story_url = _SITE_BASE + slug
         
         return {
             'headline': headline,
@@ -135,29 +186,27 @@ def extract_story_info(story_data):
             'url': story_url,
             'last_published_at': last_published_at,
             'hero_image_url': hero_image_url,
-            'scraped_at': datetime.now().isoformat()
+            'scraped_at': scraped_at
         }
     
     except Exception as e:
         print(f"Error extracting story info: {e}")
         return None
 
-def scrape_news_details(story_url):
+def scrape_news_details(story_url, scraped_at=None):
     """
     Scrape detailed content from an individual news page
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'bn,en;q=0.9,en-US;q=0.8',
-    }
+    if scraped_at is None:
+        scraped_at = datetime.now().isoformat()
     
     try:
         # Send GET request to the story page
-        response = requests.get(story_url, headers=headers, timeout=30)
+        response = _SESSION.get(story_url, timeout=30)
         response.raise_for_status()
         
         # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=_JSON_SCRIPTS)
         
         # Find all script tags with type application/json
         script_tags = soup.find_all('script', type='application/json')
@@ -168,13 +217,13 @@ def scrape_news_details(story_url):
         for script in script_tags:
             try:
                 # Parse the JSON data
-                data = json.loads(script.string)
+                data = _json_loads(str(script.string))
                 
                 # Look for the qt.data structure
                 if 'qt' in data and 'data' in data['qt']:
                     qt_data = data['qt']['data']['story']
                     # print(qt_data['story']['cards'])
-                    story_details = extract_story_details(qt_data, story_url)
+                    story_details = extract_story_details(qt_data, story_url, scraped_at)
                     if story_details:
                         break
                 
@@ -193,7 +242,7 @@ def scrape_news_details(story_url):
         print(f"Error parsing the story page {story_url}: {e}")
         return None
 
-def extract_story_details(story_data, story_url):
+def extract_story_details(story_data, story_url, scraped_at):
     """
     Extract detailed information from a story object
     """
@@ -207,34 +256,33 @@ def extract_story_details(story_data, story_url):
         hero_image_s3_key = story_data.get('hero-image-s3-key', '')
         hero_image_url = None
         if hero_image_s3_key:
-            hero_image_url = f"https://media.prothomalo.com/{hero_image_s3_key}"
+            hero_image_url = _MEDIA_BASE + hero_image_s3_key
         
-        # Extract story content from cards
-        description = ""
+        # Extract story content from cards; text parts are joined once at the end
+        description_parts = []
         image_urls = []
         textCount = 0 
         
-        cards = story_data.get('cards', [])
+        cards = story_data.get('cards', ())
         for card in cards:
-            story_elements = card.get('story-elements', [])
-            for element in story_elements:
-                element_type = element.get('type', '')
-                subtype = element.get('subtype', '')
+            for element in card.get('story-elements', ()):
+                # Only process elements with null subtype (a missing key is skipped)
+                if element.get('subtype', '') is not None:
+                    continue
                 
-                # Only process elements with null subtype
-                if subtype is None:
-                    if element_type == 'text' or element_type == 'title':
-                        text = element.get('text', '')
-                        if text:
-                            # Clean up text (remove HTML tags if any)
-                            text = re.sub('<[^<]+?>', '', text)
-                            description += text + "\n\n"
-                    
-                    elif element_type == 'image':
-                        image_s3_key = element.get('image-s3-key', '')
-                        if image_s3_key:
-                            image_url = f"https://media.prothomalo.com/{image_s3_key}"
-                            image_urls.append(image_url)
+                element_type = element.get('type')
+                if element_type == 'text' or element_type == 'title':
+                    text = element.get('text')
+                    if text:
+                        # Clean up text (remove HTML tags if any)
+                        description_parts.append(_TAG_RE.sub('', text))
+                
+                elif element_type == 'image':
+                    image_s3_key = element.get('image-s3-key')
+                    if image_s3_key:
+                        image_urls.append(_MEDIA_BASE + image_s3_key)
+        
+        description = "\n\n".join(description_parts)
         
         # Download images and get local paths
         local_images = download_images(image_urls, slug)
@@ -255,33 +303,37 @@ def extract_story_details(story_data, story_url):
             'image_urls': image_urls,
             'local_images': local_images,
             'textCount':textCount,
-            'scraped_at': datetime.now().isoformat()
+            'scraped_at': scraped_at
         }
     
     except Exception as e:
         print(f"Error extracting story details: {e}")
         return None
 
-def download_images(image_urls, slug):
+def download_images(image_urls, slug, max_workers=8):
     """
-    Download multiple images and return their local paths
+    Download multiple images concurrently and return their local paths
     """
-    local_paths = []
-    for i, image_url in enumerate(image_urls):
-        local_path = download_image(image_url, slug, f"image_{i+1}")
-        if local_path:
-            local_paths.append(local_path)
+    if not image_urls:
+        return []
+    
+    def download(item):
+        i, image_url = item
+        return download_image(image_url, slug, f"image_{i}")
     
-    return local_paths
+    # The shared session is thread-safe for GETs, so workers reuse pooled connections
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(image_urls))) as executor:
+        local_paths = list(executor.map(download, enumerate(image_urls, 1)))
+    
+    return [path for path in local_paths if path]
 
 def download_image(image_url, slug, image_name):
     """
     Download a single image and return its local path
     """
     try:
-        # Create images directory if it doesn't exist
+        # Images directory for this story
         image_dir = os.path.join("data", "images", slug)
-        os.makedirs(image_dir, exist_ok=True)
         
         # Get file extension from URL
         file_extension = os.path.splitext(image_url)[1]
@@ -296,18 +348,19 @@ def download_image(image_url, slug, image_name):
         if os.path.exists(filepath):
             return os.path.relpath(filepath, "data")
         
-        # Download the image
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        # Create the directory only once per run
+        if image_dir not in _KNOWN_DIRS:
+            os.makedirs(image_dir, exist_ok=True)
+            _KNOWN_DIRS.add(image_dir)
         
-        response = requests.get(image_url, headers=headers, stream=True, timeout=30)
+        # Download the image
+        response = _SESSION.get(image_url, stream=True, timeout=30)
         response.raise_for_status()
         
-        # Save the image
+        # Save the image in large chunks to keep read/write calls low
         with open(filepath, 'wb') as out_file:
-            response.raw.decode_content = True
-            shutil.copyfileobj(response.raw, out_file)
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                out_file.write(chunk)
         
         # print(f"Downloaded image: {filename}")
         
@@ -328,10 +381,13 @@ def scrape_all_news_details(story_list, max_stories=None, delay=1):
     if max_stories:
         story_list = story_list[:max_stories]
     
+    # One timestamp for the whole detail scrape
+    scraped_at = datetime.now().isoformat()
+    
     for i, story in enumerate(story_list, 1):
         print(f"Scraping story {i}/{len(story_list)}: {story['headline']}")
         
-        story_details = scrape_news_details(story['url'])
+        story_details = scrape_news_details(story['url'], scraped_at)
         if story_details:
             # Merge basic story info with details
             merged_story = {**story, **story_details}
@@ -344,15 +400,17 @@ def scrape_all_news_details(story_list, max_stories=None, delay=1):
     
     return detailed_stories
 
-def save_to_json(stories, filename=None, directory="data"):
+def save_to_json(stories, filename=None, directory="data", compact=True):
     """Save stories to a JSON file with Unicode support"""
     # Create directory if it doesn't exist
     if not os.path.exists(directory):
         os.makedirs(directory)
     
+    now = datetime.now()
+    
     if not filename:
         # Create filename with current timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"prothom_alo_education_news_{timestamp}.json"
     
     # Add full path
@@ -361,14 +419,15 @@ def save_to_json(stories, filename=None, directory="data"):
     # Prepare data for JSON
     data = {
         "source": "Prothom Alo Education",
-        "scraped_at": datetime.now().isoformat(),
+        "scraped_at": now.isoformat(),
         "story_count": len(stories),
         "stories": stories
     }
     
-    # Save to JSON with ensure_ascii=False to preserve Bangla characters
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Save to JSON as UTF-8 to preserve Bangla characters; indentation is
+    # only added when a human-readable file is asked for with compact=False
+    with open(filepath, 'wb') as f:
+        f.write(_json_dumps(data, compact))
     
     print(f"Data successfully saved to {filepath}")
     return filepath
@@ -376,8 +435,8 @@ def save_to_json(stories, filename=None, directory="data"):
 def load_from_json(filename):
     """Load stories from a JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = _json_loads(f.read())
         return data
     except FileNotFoundError:
         print(f"File {filename} not found.")
@@ -5,11 +5,12 @@
 # - Extracts title, author, publish time, description, image, keywords, section, and full text
 # - Respects robots.txt (optional)
 # - Saves to JSONL or CSV
-# - Includes retries, random delays, and a realistic User-Agent
+# - Includes retries, a shared delay between requests, and a realistic User-Agent
 
 # Setup
 # - Python 3.9+
-# - pip install: requests, beautifulsoup4, lxml
+# - pip install: requests, lxml
+# - Optional: orjson (faster JSON), requests-cache (for --cache)
 
 # Code
 # ```python
@@ -18,33 +19,105 @@
 
 import argparse
 import csv
+import io
 import json
-import random
-import re
+import os
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 from requests.adapters import HTTPAdapter
 from urllib.robotparser import RobotFileParser
 from urllib3.util.retry import Retry
 
-BASE = "https://www.prothomalo.com"
-SECTION_PATH = "/education"
+# Run as a script from try_code/, so the repository root is put on the path
+# to share the rate limiter in core/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.rate_limit import TokenBucket
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
 
-def make_session():
-    sess = requests.Session()
+BASE = "https://www.prothomalo.com"
+SECTION_PATH = "/education"
+WRITE_CHUNK_ROWS = 10000
+CACHE_PATH = "prothomalo.sqlite"
+CACHE_EXPIRE_AFTER = 3600
+
+# Pages are parsed once into an lxml tree and queried with XPath compiled
+# here, rather than re-reading selector strings on every page
+# Education hrefs as plain strings, for de-duplication before normalizing
+_EDU_HREFS = etree.XPath('//a[contains(@href, "/education")]/@href', smart_strings=False)
+_BODY_SELECTORS = [etree.XPath(f"({xp})[1]") for xp in (
+    "//article",
+    '//div[@itemprop="articleBody"]',
+    '//div[contains(@class, "article-body")]',
+    '//div[contains(@class, "content")]',
+    '//div[contains(@class, "story")]',
+    '//section[contains(@class, "content")]',
+)]
+_P = etree.XPath(".//p")
+_REL_NEXT_HREF = etree.XPath('(//link[@rel="next"] | //a[@rel="next"])[1]/@href', smart_strings=False)
+_NEXT_TEXTS = frozenset(("next", "older", "পরবর্তী", "আরও", "আরো", "আরও দেখুন"))
+# Anchors whose text contains the stem of some next-page text, so text_of
+# only runs on a handful of anchors instead of every link on the page
+_NEXT_CANDIDATES = etree.XPath(
+    '//a[@href][contains(translate(., "NEXTOLDR", "nextoldr"), "next")'
+    ' or contains(translate(., "NEXTOLDR", "nextoldr"), "older")'
+    ' or contains(., "পরবর্তী") or contains(., "আর")]'
+)
+_LDJSON = etree.XPath('//script[@type="application/ld+json"]/text()', smart_strings=False)
+# Text nodes as BeautifulSoup's get_text sees them, without script/style contents
+_TEXT = etree.XPath(".//text()[not(parent::script or parent::style)]")
+
+# Path characters that urljoin/urlparse strip or split on
+_SLOW_PATH_CHARS = frozenset(";\t\r\n ")
+
+# Fields that, once JSON-LD supplies all of them, make the HTML fallbacks moot
+_LD_COMPLETE_FIELDS = ("title", "description", "published_at", "image", "author", "text")
+
+# Every field parse_article can produce, in the sorted order of the CSV header
+_ARTICLE_FIELDS = (
+    "article_section", "author", "description", "image", "keywords", "lang", "published_at",
+    "scraped_at", "section", "source", "text", "title", "updated_at", "url",
+)
+_ARTICLE_FIELD_SET = frozenset(_ARTICLE_FIELDS)
+
+# orjson parses and serializes several times faster; stdlib json otherwise
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def make_session(concurrency=8, cache=False):
+    if cache and requests_cache is None:
+        print("requests-cache is not installed; fetching without a cache", file=sys.stderr)
+    if cache and requests_cache is not None:
+        # Successful responses are kept in SQLite, so reruns within the hour
+        # read pages back from disk instead of the network
+        sess = requests_cache.CachedSession(CACHE_PATH, expire_after=CACHE_EXPIRE_AFTER,
+                                            allowable_codes=(200,))
+    else:
+        sess = requests.Session()
     retry = Retry(
         total=5,
         backoff_factor=0.8,
         status_forcelist=(429, 500, 502, 503, 504),
         allowed_methods=frozenset(["GET", "HEAD"])
     )
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
+    # Enough pooled sockets per host for every concurrent article fetch
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=10,
+                          pool_maxsize=max(concurrency, 32), pool_block=False)
     sess.mount("http://", adapter)
     sess.mount("https://", adapter)
     sess.headers.update({
@@ -57,7 +130,22 @@ def make_session():
     return sess
 
 
+@lru_cache(maxsize=None)
+def _origin(base):
+    u = urlparse(base)
+    return f"{u.scheme}://{u.netloc}" if u.scheme and u.netloc else None
+
+
 def normalize_url(url, base=BASE):
+    # Root-relative hrefs (nearly every listing link) only need the origin
+    # prepended and the query/fragment cut off; anything that urljoin or
+    # urlparse would rewrite further takes the full route below
+    if url.startswith("/") and not url.startswith("//"):
+        path = url.split("#", 1)[0].split("?", 1)[0]
+        origin = _origin(base)
+        if origin and "/." not in path and not _SLOW_PATH_CHARS.intersection(path):
+            return origin + path
+
     url = urljoin(base, url)
     # strip query and fragment
     u = urlparse(url)
@@ -75,7 +163,9 @@ def parse_iso8601(dt):
         return dt  # keep raw if unknown format
 
 
+@lru_cache(maxsize=None)
 def load_robots(base=BASE):
+    # Fetched once per site per run, however often it is asked for
     rp = RobotFileParser()
     rp.set_url(urljoin(base, "/robots.txt"))
     try:
@@ -92,44 +182,60 @@ def allowed_by_robots(rp, url, ua="*"):
         return True  # be permissive if robots cannot be parsed
 
 
-def get_soup(session, url, timeout=20):
+def text_of(el, sep=""):
+    # Stripped, non-empty text pieces joined like get_text(sep, strip=True)
+    return sep.join(t.strip() for t in _TEXT(el) if t.strip())
+
+
+def fetch_html(session, url, timeout=20):
     r = session.get(url, timeout=timeout)
     r.raise_for_status()
-    # BeautifulSoup auto-detects encoding; the site is UTF-8
-    return BeautifulSoup(r.text, "lxml")
+    # Bytes go straight to lxml, skipping requests' charset detection in r.text;
+    # without a header charset, decode as UTF-8 (the site's encoding) rather
+    # than libxml2's Latin-1 default
+    content_type = r.headers.get("Content-Type", "").lower()
+    encoding = r.encoding if "charset" in content_type else "utf-8"
+    return r.content, encoding
 
 
-def extract_links_from_listing(soup, base=BASE):
-    # Select anchors pointing to Education subsection articles
-    links = set()
-    for a in soup.select('a[href]'):
-        href = a.get("href", "")
-        if not href:
-            continue
-        # Must belong to education section
-        if "/education" not in href:
-            continue
+def parse_html(content, encoding="utf-8"):
+    return lxml.html.document_fromstring(content, parser=lxml.html.HTMLParser(encoding=encoding))
+
+
+def get_tree(session, url, timeout=20):
+    return parse_html(*fetch_html(session, url, timeout))
+
+
+@lru_cache(maxsize=4096)
+def _path_depth(url):
+    # Listing pages link the same articles again and again across pages
+    return len(urlparse(url).path.strip("/").split("/"))
+
+
+def extract_links_from_listing(tree, base=BASE):
+    # Select anchors pointing to Education subsection articles; listings repeat
+    # the same href many times, so each distinct one is normalized only once.
+    # Dicts keep page order, so links come back as they appear on the listing
+    links = {}
+    for href in dict.fromkeys(_EDU_HREFS(tree)):
         # Avoid category root and tag pages by preferring deeper paths
         url = normalize_url(href, base)
         # Heuristic: article URLs often have more than 2 path segments
-        path_parts = urlparse(url).path.strip("/").split("/")
-        if len(path_parts) >= 2:  # keep broad; adjust if too many non-articles appear
-            links.add(url)
-    return sorted(links)
+        if _path_depth(url) >= 2:  # keep broad; adjust if too many non-articles appear
+            links[url] = None
+    return list(links)
 
 
-def find_next_page_url(soup, current_url):
+def find_next_page_url(tree, current_url):
     # Try rel=next first
-    link = soup.select_one('link[rel="next"], a[rel="next"]')
-    if link and link.get("href"):
-        return normalize_url(link["href"])
+    href = _REL_NEXT_HREF(tree)
+    if href and href[0]:
+        return normalize_url(href[0])
 
     # Look for common "Next" anchors (Bangla/English)
-    candidates = soup.select('a[href]')
-    for a in candidates:
-        txt = (a.get_text(strip=True) or "").lower()
-        if txt in ("next", "older", "পরবর্তী", "আরও", "আরো", "আরও দেখুন"):
-            return normalize_url(a["href"])
+    for a in _NEXT_CANDIDATES(tree):
+        if text_of(a).lower() in _NEXT_TEXTS:
+            return normalize_url(a.get("href"))
 
     # Fallback to incrementing ?page=
     parsed = urlparse(current_url)
@@ -149,11 +255,33 @@ def find_next_page_url(soup, current_url):
     return None
 
 
-def extract_json_ld(soup):
+def listing_page_urls(start_url, pages):
+    # The section paginates as ?page=N, the same guess find_next_page_url
+    # falls back to, so the first `pages` listing URLs can be built up front
+    parsed = urlparse(start_url)
+    qs = dict(parse_qsl(parsed.query))
+    urls = [start_url]
+    for n in range(2, pages + 1):
+        qs["page"] = str(n)
+        urls.append(urlunparse(parsed._replace(query=urlencode(qs))))
+    return urls
+
+
+def fetch_listing(session, url, bucket=None):
+    if bucket:
+        bucket.acquire()
+    # Failures are returned rather than raised so they surface in page order
+    try:
+        return get_tree(session, url)
+    except Exception as e:
+        return e
+
+
+def extract_json_ld(tree):
     items = []
-    for tag in soup.find_all("script", type="application/ld+json"):
+    for raw in _LDJSON(tree):
         try:
-            data = json.loads(tag.string or "")
+            data = _json_loads(raw)
             if isinstance(data, list):
                 items.extend(data)
             elif isinstance(data, dict):
@@ -171,41 +299,38 @@ def _type_matches(t, names):
     return False
 
 
-def extract_text_from_html(soup):
+def extract_text_from_html(tree):
     # Try likely content containers first
-    selectors = [
-        "article",
-        'div[itemprop="articleBody"]',
-        'div[class*="article-body"]',
-        'div[class*="content"]',
-        'div[class*="story"]',
-        'section[class*="content"]',
-    ]
-    for sel in selectors:
-        el = soup.select_one(sel)
+    for sel in _BODY_SELECTORS:
+        el = sel(tree)
         if el:
-            pts = [p.get_text(" ", strip=True) for p in el.find_all("p")]
+            pts = [text_of(p, " ") for p in _P(el[0])]
             pts = [t for t in pts if t]
             if pts:
                 return "\n\n".join(pts)
 
     # Fallback: use all <p>, but cap to reduce noise
-    pts = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
+    pts = [text_of(p, " ") for p in _P(tree)]
     pts = [t for t in pts if t]
     if pts:
         return "\n\n".join(pts[:60])
     return None
 
 
-def extract_from_meta(soup, key, attr="property"):
-    sel = soup.find("meta", {attr: key})
-    if sel and sel.get("content"):
-        return sel["content"].strip()
+def extract_from_meta(tree, key, attr="property"):
+    sel = tree.xpath(f"(//meta[@{attr}=$key])[1]", key=key)
+    if sel and sel[0].get("content"):
+        return sel[0].get("content").strip()
     return None
 
 
 def parse_article(session, url):
-    soup = get_soup(session, url)
+    return parse_article_html(url, *fetch_html(session, url))
+
+
+def parse_article_html(url, content, encoding="utf-8"):
+    # Pure parsing step with no session, so it can run on any worker
+    tree = parse_html(content, encoding)
 
     data = {
         "url": url,
@@ -216,7 +341,7 @@ def parse_article(session, url):
     }
 
     # Prefer JSON-LD
-    ld = extract_json_ld(soup)
+    ld = extract_json_ld(tree)
     article_obj = None
     for obj in ld:
         if _type_matches(obj.get("@type"), ["NewsArticle", "Article"]):
@@ -253,45 +378,81 @@ def parse_article(session, url):
         data["article_section"] = article_obj.get("articleSection")
         data["text"] = article_obj.get("articleBody")
 
-    # Meta tag fallbacks
+        # A complete JSON-LD object leaves nothing for the meta lookups or
+        # the body walk below to fill in
+        if all(data.get(k) for k in _LD_COMPLETE_FIELDS):
+            return data
+
+    # Meta tag fallbacks, each looked up only when its field is missing
     if not data.get("title"):
-        data["title"] = extract_from_meta(soup, "og:title") or (soup.title.get_text(strip=True) if soup.title else None)
+        title = tree.find(".//title")
+        data["title"] = extract_from_meta(tree, "og:title") or (text_of(title) if title is not None else None)
     if not data.get("description"):
-        data["description"] = extract_from_meta(soup, "og:description") or extract_from_meta(soup, "description", attr="name")
+        data["description"] = extract_from_meta(tree, "og:description") or extract_from_meta(tree, "description", attr="name")
     if not data.get("published_at"):
-        data["published_at"] = parse_iso8601(extract_from_meta(soup, "article:published_time"))
+        data["published_at"] = parse_iso8601(extract_from_meta(tree, "article:published_time"))
     if not data.get("image"):
-        data["image"] = extract_from_meta(soup, "og:image")
+        data["image"] = extract_from_meta(tree, "og:image")
     if not data.get("author"):
-        data["author"] = extract_from_meta(soup, "author", attr="name") or extract_from_meta(soup, "article:author")
+        data["author"] = extract_from_meta(tree, "author", attr="name") or extract_from_meta(tree, "article:author")
 
     if not data.get("text"):
-        data["text"] = extract_text_from_html(soup)
+        data["text"] = extract_text_from_html(tree)
 
     return data
 
 
+def fetch_article(session, url, idx, total, bucket=None):
+    # Wait for a token so the workers together keep the polite rate
+    if bucket:
+        bucket.acquire()
+
+    row = None
+    try:
+        row = parse_article(session, url)
+        print(f"  [{idx}/{total}] {row.get('title') or url}")
+    except Exception as e:
+        print(f"  Error parsing {url}: {e}", file=sys.stderr)
+
+    return row
+
+
+def jsonl_row(r):
+    if orjson:
+        # UTF-8 bytes with the newline appended by orjson itself
+        return orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8")
+
+
 def write_jsonl(path, rows):
-    with open(path, "w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    # One write per chunk of rows instead of one per row; chunking bounds
+    # the buffer on very large runs
+    with open(path, "wb") as f:
+        for i in range(0, len(rows), WRITE_CHUNK_ROWS):
+            f.write(b"".join(jsonl_row(r) for r in rows[i:i + WRITE_CHUNK_ROWS]))
 
 
 def write_csv(path, rows):
     if not rows:
         return
-    # Gather all keys to keep columns stable
-    keys = sorted(set().union(*(r.keys() for r in rows)))
+    # Rows from parse_article share a fixed schema; gather and sort the keys
+    # only when some row carries a field outside it
+    if all(map(_ARTICLE_FIELD_SET.issuperset, rows)):
+        keys = _ARTICLE_FIELDS
+    else:
+        keys = sorted(set().union(*(r.keys() for r in rows)))
+    # Build the whole file in memory and write it once
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=keys)
+    w.writeheader()
+    w.writerows(rows)
     with open(path, "w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=keys)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        f.write(buf.getvalue())
 
 
 def scrape_education(pages=1, max_articles=None, out="education.jsonl", out_format="jsonl",
-                     min_delay=1.5, max_delay=3.5, respect_robots=True):
-    session = make_session()
+                     min_delay=1.5, max_delay=3.5, respect_robots=True, concurrency=8, cache=False):
+    session = make_session(concurrency, cache)
     rp = load_robots() if respect_robots else None
 
     start_url = urljoin(BASE, SECTION_PATH)
@@ -300,19 +461,33 @@ def scrape_education(pages=1, max_articles=None, out="education.jsonl", out_form
         print("Blocked by robots.txt for the section page. Exiting.", file=sys.stderr)
         return
 
+    # Every listing and article request takes from one token bucket that
+    # allows a request per average delay, the rate of a sequential crawl
+    mean_delay = (min_delay + max_delay) / 2
+    bucket = TokenBucket(1 / mean_delay) if mean_delay > 0 else None
+
     all_links = []
     seen = set()
     current = start_url
 
+    # Fetch the predictable listing pages side by side; a next link that
+    # leads anywhere else is still followed with a fetch of its own below
+    prefetched = {}
+    if pages > 1:
+        urls = listing_page_urls(start_url, pages)
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, pages))) as executor:
+            prefetched = dict(zip(urls, executor.map(lambda u: fetch_listing(session, u, bucket), urls)))
+
     for i in range(pages):
         print(f"[Listing] Fetching: {current}")
-        try:
-            soup = get_soup(session, current)
-        except Exception as e:
-            print(f"Failed to fetch listing page: {e}", file=sys.stderr)
+        tree = prefetched.pop(current, None)
+        if tree is None:
+            tree = fetch_listing(session, current, bucket)
+        if isinstance(tree, Exception):
+            print(f"Failed to fetch listing page: {tree}", file=sys.stderr)
             break
 
-        links = extract_links_from_listing(soup, base=BASE)
+        links = extract_links_from_listing(tree, base=BASE)
         # Filter by robots and dedupe
         for url in links:
             if url in seen:
@@ -329,26 +504,22 @@ def scrape_education(pages=1, max_articles=None, out="education.jsonl", out_form
         if max_articles and len(all_links) >= max_articles:
             break
 
-        next_url = find_next_page_url(soup, current)
+        next_url = find_next_page_url(tree, current)
         if not next_url:
             print("No next page detected.")
             break
         current = next_url
 
-        time.sleep(random.uniform(min_delay, max_delay))
-
-    # Fetch articles
+    # Fetch articles; pages are independent, so several are in flight at
+    # once while the shared bucket keeps the overall rate
     print(f"\n[Articles] Fetching up to {len(all_links)} article pages...")
-    rows = []
-    for idx, url in enumerate(all_links, 1):
-        try:
-            row = parse_article(session, url)
-            rows.append(row)
-            print(f"  [{idx}/{len(all_links)}] {row.get('title') or url}")
-        except Exception as e:
-            print(f"  Error parsing {url}: {e}", file=sys.stderr)
-
-        time.sleep(random.uniform(min_delay, max_delay))
+    total = len(all_links)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = executor.map(
+            lambda item: fetch_article(session, item[1], item[0], total, bucket),
+            enumerate(all_links, 1),
+        )
+        rows = [row for row in results if row is not None]
 
     # Output
     if out_format == "jsonl":
@@ -368,9 +539,12 @@ def main():
     p.add_argument("--max-articles", type=int, default=None, help="Max number of articles")
     p.add_argument("--out", type=str, default="education.jsonl", help="Output file path")
     p.add_argument("--format", type=str, choices=["jsonl", "csv"], default="jsonl", help="Output format")
-    p.add_argument("--min-delay", type=float, default=1.5, help="Min delay between requests (seconds)")
+    p.add_argument("--min-delay", type=float, default=1.5, help="Min delay between requests (seconds); requests are spaced by the mean of min and max")
     p.add_argument("--max-delay", type=float, default=3.5, help="Max delay between requests (seconds)")
     p.add_argument("--no-robots", action="store_true", help="Ignore robots.txt")
+    p.add_argument("--concurrency", type=int, default=8, help="Article pages in flight at once; the delays still cap the overall rate")
+    p.add_argument("--cache", action="store_true",
+                   help=f"Reuse responses cached in {CACHE_PATH} (needs requests-cache)")
     args = p.parse_args()
 
     scrape_education(
@@ -381,6 +555,8 @@ def main():
         min_delay=args.min_delay,
         max_delay=args.max_delay,
         respect_robots=not args.no_robots,
+        concurrency=args.concurrency,
+        cache=args.cache,
     )
 
 
@@ -390,10 +566,12 @@ if __name__ == "__main__":
 
 # How to run
 # - Install deps:
-#   - pip install requests beautifulsoup4 lxml
+#   - pip install requests lxml
+#   - Optional: pip install orjson requests-cache
 # - Run:
 #   - python prothomalo_education_scraper.py --pages 2 --max-articles 40 --out education.jsonl
 #   - Or CSV: python prothomalo_education_scraper.py --pages 3 --format csv --out education.csv
+#   - While iterating on the parser: add --cache (pip install requests-cache) to reuse fetched pages
 
 # Notes and tips
 # - Always review robots.txt and the site’s Terms before scraping.
@@ -1,15 +1,24 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+import lxml  # noqa: F401 -- the "lxml" parser below; fail at import if it is missing
 import json
 from datetime import datetime
 
 BASE_URL = "https://www.prothomalo.com"
 EDU_URL = f"{BASE_URL}/education"
 
+# One keep-alive session for the listing and every article request,
+# like make_session in prothomalo.py
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+
 def scrape_prothomalo_education():
     data = []
-    response = requests.get(EDU_URL, headers={"User-Agent": "Mozilla/5.0"})
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = SESSION.get(EDU_URL)
+    soup = BeautifulSoup(response.text, "lxml")
     data_script = soup.find('script', id='static-page')
     if data_script:
         import json
@@ -21,8 +30,8 @@ def scrape_prothomalo_education():
     articles = soup.find_all("a", {"class": "title-link"}, href=True)
     for a in articles[:5]:  # limit to first 5 for demo
         url = BASE_URL + a['href']
-        article_res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-        article_soup = BeautifulSoup(article_res.text, "html.parser")
+        article_res = SESSION.get(url)
+        article_soup = BeautifulSoup(article_res.text, "lxml")
 
         title = article_soup.find("h1").text.strip() if article_soup.find("h1") else "No Title"
         body = " ".join([p.text for p in article_soup.find_all("p")])